@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""
+Benchmark: end-to-end governor switch latency, serial vs. parallel writes.
+
+Times the write path of SetGovernor: _write_policies() setting
+scaling_governor once per cpufreq policy within a SysfsTransaction, which
+reads each current value for rollback before writing. This is done once
+with a serial SysfsWriter and once per worker count. By default a fake
+tree with one policy per CPU is used and each write sleeps
+--write-latency-ms to stand in for the kernel restarting the governor.
+With --sysfs (root only) the real governors of this host are switched
+back and forth and restored afterwards.
+
+Usage: python3 daemon/benchmarks/bench_governor_switch.py
+           [--sysfs] [--cpus N] [--workers 4,8,16] [--rounds N]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import cpugov_daemon  # noqa: E402
+from cpugov_daemon import (  # noqa: E402
+    AVAIL_GOVERNORS_PATH,
+    CPUGovDaemon,
+    POLICY_AFFECTED_CPUS,
+    POLICY_GOVERNOR,
+    SysfsReader,
+    SysfsTransaction,
+    SysfsWriter,
+)
+
+
+def make_fake_tree(root, cpu_count):
+    """Create cpufreq/policyN with cpuN/cpufreq linking to it under root."""
+    for n in range(cpu_count):
+        policy = os.path.join(root, "cpufreq", f"policy{n}")
+        os.makedirs(policy)
+        with open(os.path.join(policy, POLICY_GOVERNOR), "w") as f:
+            f.write("powersave\n")
+        with open(os.path.join(policy, POLICY_AFFECTED_CPUS), "w") as f:
+            f.write(f"{n}\n")
+        os.makedirs(os.path.join(root, f"cpu{n}"))
+        os.symlink(policy, os.path.join(root, f"cpu{n}", "cpufreq"))
+
+
+def simulate_latency(latency_s):
+    """Make every SysfsWriter write take at least latency_s."""
+    real_write = SysfsWriter.write
+
+    def slow_write(path, value):
+        time.sleep(latency_s)
+        real_write(path, value)
+
+    SysfsWriter.write = staticmethod(slow_write)
+
+
+def time_switches(reader, writer, policies, governors, rounds):
+    """Return the mean seconds per switch, alternating between governors."""
+    start = time.perf_counter()
+    for i in range(rounds):
+        governor = governors[i % len(governors)]
+        transaction = SysfsTransaction(reader, writer)
+        failures = CPUGovDaemon._write_policies(
+            transaction, policies, POLICY_GOVERNOR, governor
+        )
+        if failures:
+            transaction.rollback()
+            policy, e = failures[0]
+            sys.exit(f"write failed: {policy.path}: {e}")
+    return (time.perf_counter() - start) / rounds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sysfs", action="store_true",
+                        help="switch the real governors of this host (root)")
+    parser.add_argument("--cpus", type=int, default=256,
+                        help="CPUs in the fake tree (default: 256)")
+    parser.add_argument("--workers", default="4,8,16",
+                        help="comma-separated pool sizes (default: 4,8,16)")
+    parser.add_argument("--rounds", type=int, default=10,
+                        help="switches per measurement (default: 10)")
+    parser.add_argument("--write-latency-ms", type=float, default=2.0,
+                        help="simulated per-write latency (default: 2)")
+    args = parser.parse_args()
+    worker_counts = [int(n) for n in args.workers.split(",") if n]
+
+    with tempfile.TemporaryDirectory() as root:
+        if args.sysfs:
+            cpu_dirs = CPUGovDaemon._scan_cpu_dirs()
+            if not cpu_dirs:
+                sys.exit("no CPUs with cpufreq found")
+            policies = CPUGovDaemon._scan_policies(cpu_dirs)
+            available = CPUGovDaemon._read_sysfs(
+                os.path.join(cpu_dirs[0], AVAIL_GOVERNORS_PATH)
+            ).split()
+            original = [(policy.attr(POLICY_GOVERNOR),
+                         CPUGovDaemon._read_sysfs(
+                             policy.attr(POLICY_GOVERNOR)))
+                        for policy in policies]
+            governors = [g for g in ("performance", "powersave")
+                         if g in available] or available[:2]
+        else:
+            make_fake_tree(root, args.cpus)
+            cpugov_daemon.SYSFS_CPU_BASE = root
+            policies = CPUGovDaemon._scan_policies(
+                CPUGovDaemon._scan_cpu_dirs()
+            )
+            governors = ["performance", "powersave"]
+            original = None
+            simulate_latency(args.write_latency_ms / 1000)
+
+        cpu_count = sum(len(policy.cpus) for policy in policies)
+        print(f"{cpu_count} CPUs in {len(policies)} policies, switching "
+              f"between {' and '.join(governors)}")
+        print(f"{'workers':>8}  {'ms/switch':>10}  speedup")
+
+        reader = SysfsReader()
+        try:
+            serial = time_switches(reader, SysfsWriter(), policies,
+                                   governors, args.rounds)
+            print(f"{'serial':>8}  {serial * 1e3:10.2f}  {1:7.2f}x")
+            for workers in worker_counts:
+                writer = SysfsWriter(workers)
+                parallel = time_switches(reader, writer, policies,
+                                         governors, args.rounds)
+                writer.shutdown()
+                print(f"{workers:>8}  {parallel * 1e3:10.2f}"
+                      f"  {serial / parallel:7.2f}x")
+        finally:
+            if original:
+                SysfsWriter().write_many(original)
+            reader.reset()
+
+
+if __name__ == "__main__":
+    main()
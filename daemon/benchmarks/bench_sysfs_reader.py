@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""
+Microbenchmark: open/read/close vs. persistent-fd SysfsReader.
+
+Reads scaling_cur_freq and scaling_governor for every CPU, the same work
+GetCpuInfo does per poll. By default a fake cpufreq tree with 8, 64 and
+512 CPUs is generated in a temporary directory; pass --sysfs to measure
+the real /sys/devices/system/cpu of this machine instead.
+
+Usage: python3 daemon/benchmarks/bench_sysfs_reader.py [--sysfs] [--rounds N]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import cpugov_daemon  # noqa: E402
+from cpugov_daemon import (  # noqa: E402
+    CPUGovDaemon,
+    CUR_FREQ_PATH,
+    GOVERNOR_PATH,
+    SysfsReader,
+)
+
+CPU_COUNTS = (8, 64, 512)
+
+
+def make_fake_tree(root, cpu_count):
+    """Create cpuN/cpufreq/{scaling_cur_freq,scaling_governor} under root."""
+    for n in range(cpu_count):
+        cpufreq = os.path.join(root, f"cpu{n}", "cpufreq")
+        os.makedirs(cpufreq)
+        with open(os.path.join(cpufreq, "scaling_cur_freq"), "w") as f:
+            f.write(f"{800000 + n * 1000}\n")
+        with open(os.path.join(cpufreq, "scaling_governor"), "w") as f:
+            f.write("powersave\n")
+
+
+def hot_paths(cpu_dirs):
+    """Return the per-poll attribute paths for the given cpu dirs."""
+    paths = []
+    for cpu_dir in cpu_dirs:
+        paths.append(os.path.join(cpu_dir, GOVERNOR_PATH))
+        paths.append(os.path.join(cpu_dir, CUR_FREQ_PATH))
+    return paths
+
+
+def bench(read, paths, rounds):
+    """Return the mean seconds per poll (one read of every path)."""
+    for path in paths:  # warm up (and open fds for the reader)
+        read(path)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for path in paths:
+            read(path)
+    return (time.perf_counter() - start) / rounds
+
+
+def report(label, paths, rounds):
+    reader = SysfsReader()
+    baseline = bench(CPUGovDaemon._read_sysfs, paths, rounds)
+    persistent = bench(reader.read, paths, rounds)
+    reader.reset()
+    print(f"{label:>10}  {baseline * 1e6:12.1f}  {persistent * 1e6:12.1f}"
+          f"  {baseline / persistent:7.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sysfs", action="store_true",
+                        help="benchmark the real sysfs tree of this host")
+    parser.add_argument("--rounds", type=int, default=200,
+                        help="polls per measurement (default: 200)")
+    args = parser.parse_args()
+
+    print(f"{'CPUs':>10}  {'open/close µs':>12}  {'pread µs':>12}  speedup")
+
+    if args.sysfs:
+        cpu_dirs = CPUGovDaemon._scan_cpu_dirs()
+        report(str(len(cpu_dirs)), hot_paths(cpu_dirs), args.rounds)
+        return
+
+    for count in CPU_COUNTS:
+        with tempfile.TemporaryDirectory() as root:
+            make_fake_tree(root, count)
+            cpugov_daemon.SYSFS_CPU_BASE = root
+            cpu_dirs = CPUGovDaemon._scan_cpu_dirs()
+            report(str(count), hot_paths(cpu_dirs), args.rounds)
+
+
+if __name__ == "__main__":
+    main()
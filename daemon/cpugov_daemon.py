@@ -10,11 +10,19 @@ Object:   /io/github/serverket/cpugov
 Interface: io.github.serverket.cpugov
 """
 
+import array
+import collections
+import itertools
+import concurrent.futures
+import errno
 import json
 import os
 import glob
 import signal
+import socket
+import struct
 import sys
+import time
 from pathlib import Path
 
 import dbus
@@ -27,214 +35,3371 @@ OBJECT_PATH = "/io/github/serverket/cpugov"
 INTERFACE_NAME = "io.github.serverket.cpugov"
 
 POLKIT_ACTION_SET = "io.github.serverket.cpugov.set-governor"
+# Long enough for an admin to type a password in the auth dialog, and
+# shorter than the 30 s clients wait for a reply, so a request is never
+# applied after its caller gave up; the dialog is cancelled on expiry
+POLKIT_TIMEOUT_S = 25
+# How long a positive Polkit answer is reused for the same caller and
+# action (overridable in config.json, 0 disables caching)
+DEFAULT_POLKIT_CACHE_TTL_S = 60
 
 SYSFS_CPU_BASE = "/sys/devices/system/cpu"
 GOVERNOR_PATH = "cpufreq/scaling_governor"
+POLICY_GLOB = "cpufreq/policy[0-9]*"
+POLICY_GOVERNOR = "scaling_governor"
+POLICY_AFFECTED_CPUS = "affected_cpus"
+POLICY_MIN_FREQ = "scaling_min_freq"
+POLICY_MAX_FREQ = "scaling_max_freq"
+POLICY_CPUINFO_MIN_FREQ = "cpuinfo_min_freq"
+POLICY_CPUINFO_MAX_FREQ = "cpuinfo_max_freq"
+POLICY_BOOST = "boost"
+INTEL_NO_TURBO_PATH = "intel_pstate/no_turbo"
+CPUFREQ_BOOST_PATH = "cpufreq/boost"
+POLICY_TIME_IN_STATE = "stats/time_in_state"
+POLICY_TOTAL_TRANS = "stats/total_trans"
+# Residency snapshots kept per client for GetFrequencyResidency(since_ns),
+# besides the one taken at startup
+MAX_RESIDENCY_SNAPSHOTS = 32
+POLICY_EPP = "energy_performance_preference"
+POLICY_AVAIL_EPP = "energy_performance_available_preferences"
+# Upper bound for CPU numbers accepted in CPU lists
+MAX_CPU_NUMBER = 65535
 AVAIL_GOVERNORS_PATH = "cpufreq/scaling_available_governors"
 CUR_FREQ_PATH = "cpufreq/scaling_cur_freq"
 MIN_FREQ_PATH = "cpufreq/cpuinfo_min_freq"
 MAX_FREQ_PATH = "cpufreq/cpuinfo_max_freq"
 CPU_MODEL_PATH = "/proc/cpuinfo"
+POWER_SUPPLY_BASE = "/sys/class/power_supply"
+THERMAL_BASE = "/sys/class/thermal"
+HWMON_BASE = "/sys/class/hwmon"
+# Relative to a CPU directory
+TOPOLOGY_PACKAGE_PATH = "topology/physical_package_id"
+TOPOLOGY_CORE_PATH = "topology/core_id"
+# hwmon drivers for CPU temperatures; thermal zone types that describe a
+# whole CPU package
+CPU_HWMON_DRIVERS = ("coretemp", "k10temp")
+CPU_THERMAL_ZONE_TYPES = ("x86_pkg_temp", "cpu-thermal", "cpu_thermal")
 CONFIG_PATH = "/var/lib/cpugov/config.json"
+PROFILES_PATH = "/var/lib/cpugov/profiles.json"
+
+# Built-in profiles; profiles.json may override them or add more. A
+# setting may list candidates, of which the first available one is used,
+# so one profile fits drivers with different governors. Settings a host
+# cannot control (EPP, boost) are skipped. Frequency limits of 0 mean
+# the hardware limit.
+DEFAULT_PROFILES = {
+    "latency": {
+        "governor": ["performance"],
+        "energy_preference": ["performance"],
+        "frequency_limits": [0, 0],
+        "boost": True,
+    },
+    "throughput": {
+        "governor": ["schedutil", "ondemand", "powersave"],
+        "energy_preference": ["balance_performance"],
+        "frequency_limits": [0, 0],
+        "boost": True,
+    },
+    "eco": {
+        "governor": ["powersave", "conservative", "schedutil"],
+        "energy_preference": ["power", "balance_power"],
+        "frequency_limits": [0, 0],
+        "boost": False,
+    },
+}
+
+# Kernel uevents (hotplug notifications) arrive on this netlink family,
+# multicast group 1.
+NETLINK_KOBJECT_UEVENT = 15
+UEVENT_GROUP_KERNEL = 1
+UEVENT_BUFFER_SIZE = 64 * 1024
+
+# Process exec/exit events come from the netlink process connector
+NETLINK_CONNECTOR = 11
+CN_IDX_PROC = 1
+CN_VAL_PROC = 1
+PROC_CN_MCAST_LISTEN = 1
+PROC_EVENT_EXEC = 0x00000002
+PROC_EVENT_EXIT = 0x80000000
+NLMSG_DONE = 3
+# nlmsghdr, cn_msg, then proc_event's what/cpu/timestamp_ns
+NLMSG_HEADER = struct.Struct("=IHHII")
+CN_MSG_HEADER = struct.Struct("=IIIIHH")
+PROC_EVENT_HEADER = struct.Struct("=IIQ")
+PROC_EVENT_PIDS = struct.Struct("=II")
+# Rescan interval of the /proc fallback for kernels without the connector
+DEFAULT_PROCESS_SCAN_INTERVAL_S = 5
+
+# Shared frequency sampler defaults (overridable in config.json)
+DEFAULT_SAMPLE_INTERVAL_MS = 2000
+MIN_SAMPLE_INTERVAL_MS = 100
+
+# Hot attributes are short ("powersave", "3400000"); one page is plenty.
+SYSFS_READ_SIZE = 64
+
+# Only the cpu lines at the top of /proc/stat are read; the buffer grows
+# if they do not fit.
+PROC_STAT_PATH = "/proc/stat"
+PROC_STAT_READ_SIZE = 16 * 1024
+
+# Load-driven governor switching ("auto" in config.json). Loads are in
+# percent; "profile", when set, is applied instead of "governor".
+DEFAULT_AUTO_SETTINGS = {
+    "enabled": False,
+    "interval_ms": 1000,
+    "up_threshold": 80,
+    "down_threshold": 40,
+    "core_up_threshold": 95,
+    "core_down_threshold": 70,
+    "up_dwell_s": 2,
+    "down_dwell_s": 10,
+    "governor": "performance",
+    "profile": "",
+}
+
+# Temporary settings claimed by daemon subsystems or clients are
+# arbitrated by priority; on a tie the more performant governor wins.
+OVERRIDE_PRIORITY_POWER = 10
+OVERRIDE_PRIORITY_AUTO = 20
+OVERRIDE_PRIORITY_RULES = 30
+OVERRIDE_PRIORITY_HOLD = 40
+OVERRIDE_PRIORITY_LEASE = 40
+# Config keys of explicit settings -> the override setting they compete with
+OVERRIDE_SETTING_KEYS = {
+    "governor": "governor",
+    "cpu_governors": "governor",
+    "energy_preference": "energy_preference",
+    "cpu_energy_preferences": "energy_preference",
+    "frequency_limits": "frequency_limits",
+    "cpu_frequency_limits": "frequency_limits",
+    "boost": "boost",
+}
+GOVERNOR_RANK = ("powersave", "conservative", "userspace", "ondemand",
+                 "schedutil", "performance")
+
+
+def parse_cpu_list(text):
+    """Parse a kernel-style CPU list such as "0-7,16-23" into CPU numbers."""
+    cpus = []
+    for part in text.replace(" ", "").split(","):
+        if not part:
+            continue
+        lo, sep, hi = part.partition("-")
+        lo = int(lo)
+        hi = int(hi) if sep else lo
+        if lo < 0 or hi < lo or hi > MAX_CPU_NUMBER:
+            raise ValueError(f"invalid CPU range: {part}")
+        cpus.extend(range(lo, hi + 1))
+    return cpus
+
+
+def format_cpu_list(cpus):
+    """Format CPU numbers the way the kernel does, e.g. "0-3,8,10-11"."""
+    ranges = []
+    for cpu in sorted(set(cpus)):
+        if ranges and cpu == ranges[-1][1] + 1:
+            ranges[-1][1] = cpu
+        else:
+            ranges.append([cpu, cpu])
+    return ",".join(str(lo) if lo == hi else f"{lo}-{hi}"
+                    for lo, hi in ranges)
+
+
+class CpufreqPolicy:
+    """A cpufreq policy: one set of scaling attributes shared by its CPUs."""
+
+    def __init__(self, path, cpus):
+        self.path = path
+        self.name = os.path.basename(path)
+        self.cpus = cpus
+
+    def attr(self, name):
+        """Return the path of one of the policy's attributes."""
+        return os.path.join(self.path, name)
+
+
+class SysfsReader:
+    """Re-read hot sysfs attributes through persistent file descriptors.
+
+    sysfs regenerates an attribute's contents on every read at offset 0,
+    so one fd per attribute can be kept open and re-read with a positional
+    read into a reusable buffer instead of paying open/read/close each poll.
+    """
+
+    def __init__(self, size=SYSFS_READ_SIZE):
+        self._fds = {}
+        self._buf = bytearray(size)
+
+    def read(self, path):
+        """Return the stripped contents of path, or "" if unreadable."""
+        for _attempt in range(2):
+            fd = self._fds.get(path)
+            if fd is None:
+                try:
+                    fd = os.open(path, os.O_RDONLY | os.O_CLOEXEC)
+                except OSError:
+                    return ""
+                self._fds[path] = fd
+
+            try:
+                n = os.preadv(fd, [self._buf], 0)
+            except OSError as e:
+                self.close(path)
+                # The attribute went away under us (CPU offlined, driver
+                # rebound): reopen once, the path may be valid again.
+                if e.errno in (errno.ENODEV, errno.ENOENT, errno.EBADF):
+                    continue
+                return ""
+            return self._buf[:n].decode(errors="replace").strip()
+        return ""
+
+    def close(self, path):
+        """Close the fd cached for path, if any."""
+        fd = self._fds.pop(path, None)
+        if fd is not None:
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    def reset(self):
+        """Close every cached fd, e.g. after a topology change."""
+        for path in list(self._fds):
+            self.close(path)
+
+
+class UeventMonitor:
+    """Watch kernel uevents on a netlink socket from the GLib main loop.
+
+    Handlers are registered per subsystem and receive the parsed event
+    as a dict (ACTION, DEVPATH, SUBSYSTEM, ...).
+    """
+
+    def __init__(self):
+        self._handlers = {}
+        self._sock = None
+        self._watch_id = None
+
+    def add_handler(self, subsystem, callback):
+        """Call callback(event) for every uevent of the given subsystem."""
+        self._handlers.setdefault(subsystem, []).append(callback)
+
+    def start(self):
+        """Open the netlink socket and attach it to the main loop."""
+        if self._sock is not None:
+            return True
+        try:
+            sock = socket.socket(
+                socket.AF_NETLINK,
+                socket.SOCK_DGRAM | socket.SOCK_NONBLOCK | socket.SOCK_CLOEXEC,
+                NETLINK_KOBJECT_UEVENT,
+            )
+            sock.bind((0, UEVENT_GROUP_KERNEL))
+        except (AttributeError, OSError) as e:
+            print(f"cpugov-daemon: uevent monitor unavailable: {e}",
+                  file=sys.stderr)
+            return False
+
+        self._sock = sock
+        self._watch_id = GLib.io_add_watch(
+            sock.fileno(), GLib.PRIORITY_DEFAULT,
+            GLib.IO_IN | GLib.IO_ERR | GLib.IO_HUP,
+            self._on_readable,
+        )
+        return True
+
+    def stop(self):
+        """Detach from the main loop and close the socket."""
+        if self._watch_id is not None:
+            GLib.source_remove(self._watch_id)
+            self._watch_id = None
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+    def _on_readable(self, fd, condition):
+        """Drain all pending uevents and dispatch them."""
+        while True:
+            try:
+                data, (sender_pid, _groups) = self._sock.recvfrom(
+                    UEVENT_BUFFER_SIZE
+                )
+            except BlockingIOError:
+                break
+            except OSError as e:
+                # ENOBUFS: the kernel dropped events; keep listening.
+                print(f"cpugov-daemon: uevent receive error: {e}",
+                      file=sys.stderr)
+                break
+
+            # Only trust messages sent by the kernel itself.
+            if sender_pid != 0:
+                continue
+
+            event = self._parse(data)
+            for callback in self._handlers.get(event.get("SUBSYSTEM"), ()):
+                callback(event)
+        return True
+
+    @staticmethod
+    def _parse(data):
+        """Parse an 'ACTION@DEVPATH\\0KEY=VALUE\\0...' uevent message."""
+        event = {}
+        for field in data.split(b"\0")[1:]:
+            key, sep, value = field.partition(b"=")
+            if sep:
+                event[key.decode(errors="replace")] = \
+                    value.decode(errors="replace")
+        return event
+
+
+class ProcessMonitor:
+    """Watch process exec and exit events on the netlink proc connector.
+
+    on_exec(pid) and on_exit(pid) are called for thread group leaders;
+    on_overrun() is called when the kernel dropped events, after which
+    the caller should rescan /proc. Needs CAP_NET_ADMIN.
+    """
+
+    def __init__(self, on_exec, on_exit, on_overrun):
+        self._on_exec = on_exec
+        self._on_exit = on_exit
+        self._on_overrun = on_overrun
+        self._sock = None
+        self._watch_id = None
+
+    def start(self):
+        """Subscribe to process events and attach to the main loop."""
+        if self._sock is not None:
+            return True
+        payload = struct.pack("=I", PROC_CN_MCAST_LISTEN)
+        message = (
+            NLMSG_HEADER.pack(
+                NLMSG_HEADER.size + CN_MSG_HEADER.size + len(payload),
+                NLMSG_DONE, 0, 0, os.getpid(),
+            )
+            + CN_MSG_HEADER.pack(CN_IDX_PROC, CN_VAL_PROC, 0, 0,
+                                 len(payload), 0)
+            + payload
+        )
+        try:
+            sock = socket.socket(
+                socket.AF_NETLINK,
+                socket.SOCK_DGRAM | socket.SOCK_NONBLOCK | socket.SOCK_CLOEXEC,
+                NETLINK_CONNECTOR,
+            )
+            sock.bind((os.getpid(), CN_IDX_PROC))
+            sock.send(message)
+        except (AttributeError, OSError) as e:
+            print(f"cpugov-daemon: process connector unavailable: {e}",
+                  file=sys.stderr)
+            return False
+
+        self._sock = sock
+        self._watch_id = GLib.io_add_watch(
+            sock.fileno(), GLib.PRIORITY_DEFAULT,
+            GLib.IO_IN | GLib.IO_ERR | GLib.IO_HUP,
+            self._on_readable,
+        )
+        return True
+
+    def stop(self):
+        """Detach from the main loop and close the socket."""
+        if self._watch_id is not None:
+            GLib.source_remove(self._watch_id)
+            self._watch_id = None
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+    def _on_readable(self, fd, condition):
+        """Drain all pending process events and dispatch them."""
+        while True:
+            try:
+                data, (sender_pid, _groups) = self._sock.recvfrom(
+                    UEVENT_BUFFER_SIZE
+                )
+            except BlockingIOError:
+                break
+            except OSError as e:
+                if e.errno == errno.ENOBUFS:
+                    self._on_overrun()
+                    continue
+                print(f"cpugov-daemon: process event receive error: {e}",
+                      file=sys.stderr)
+                break
+
+            # Only trust messages sent by the kernel itself.
+            if sender_pid != 0:
+                continue
+            self._dispatch(data)
+        return True
+
+    def _dispatch(self, data):
+        """Parse one proc connector message and call the handlers."""
+        offset = NLMSG_HEADER.size + CN_MSG_HEADER.size
+        if len(data) < offset + PROC_EVENT_HEADER.size + PROC_EVENT_PIDS.size:
+            return
+        idx, val = CN_MSG_HEADER.unpack_from(data, NLMSG_HEADER.size)[:2]
+        if (idx, val) != (CN_IDX_PROC, CN_VAL_PROC):
+            return
+
+        what = PROC_EVENT_HEADER.unpack_from(data, offset)[0]
+        pid, tgid = PROC_EVENT_PIDS.unpack_from(
+            data, offset + PROC_EVENT_HEADER.size
+        )
+        # Thread exits are not process exits
+        if pid != tgid:
+            return
+        if what == PROC_EVENT_EXEC:
+            self._on_exec(pid)
+        elif what == PROC_EVENT_EXIT:
+            self._on_exit(pid)
+
+
+class SysfsWriter:
+    """Write sysfs attributes, optionally fanned out over a thread pool.
+
+    A scaling_governor write makes the kernel stop and restart the
+    governor of that CPU's policy, which can take milliseconds. Writes to
+    different policies are independent, so with workers > 1 a batch is
+    spread over a bounded pool instead of being issued one by one.
+    """
+
+    def __init__(self, workers=0):
+        self._pool = None
+        if workers > 1:
+            self._pool = concurrent.futures.ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="cpugov-write"
+            )
+
+    @staticmethod
+    def write(path, value):
+        """Write a value to a sysfs file."""
+        with open(path, "w") as f:
+            f.write(value)
+
+    def write_many(self, writes):
+        """Perform a batch of (path, value) writes.
+
+        Every write is attempted; returns (path, error) for each failure.
+        """
+        def attempt(item):
+            path, value = item
+            try:
+                self.write(path, value)
+            except (IOError, OSError) as e:
+                return path, e
+            return None
+
+        if self._pool is None or len(writes) < 2:
+            results = map(attempt, writes)
+        else:
+            results = self._pool.map(attempt, writes)
+        return [failure for failure in results if failure is not None]
+
+    def shutdown(self):
+        """Stop the worker threads, if any."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+
+class SysfsTransaction:
+    """Apply sysfs writes all-or-nothing.
+
+    Writes are applied in steps; within a step they are independent and
+    may run in parallel. Before writing, the current value of each
+    attribute is read so rollback() can restore it, and attributes that
+    already hold the target value are left alone.
+    """
+
+    def __init__(self, reader, writer):
+        self._reader = reader
+        self._writer = writer
+        self._undo_steps = []
+
+    def apply(self, writes):
+        """Apply one step of (path, value) writes.
+
+        Returns (path, error) for each write that failed. Successful
+        writes are recorded for rollback().
+        """
+        previous = {}
+        pending = []
+        for path, value in writes:
+            current = self._reader.read(path)
+            if current != value:
+                previous[path] = current
+                pending.append((path, value))
+
+        failures = self._writer.write_many(pending)
+        failed = {path for path, _e in failures}
+        self._undo_steps.append([
+            (path, previous[path]) for path, _value in pending
+            if path not in failed and previous[path]
+        ])
+        return failures
+
+    def rollback(self):
+        """Restore every recorded write, most recent step first.
+
+        Returns (path, error) for each value that could not be restored.
+        """
+        failures = []
+        while self._undo_steps:
+            failures.extend(self._writer.write_many(self._undo_steps.pop()))
+        return failures
+
+
+class FrequencySampler:
+    """Sample per-core frequencies and governors on one shared timer.
+
+    Every tick reads the hot attributes of each core once, plus /proc/stat
+    once for per-core utilization when a ProcStatSampler is given, so the
+    cost is independent of how many clients are watching. The last value
+    of each core is kept together with the generation in which it last
+    changed; the generation only advances when something did change, and
+    on_change is then called with (since, generation) so deltas can be
+    published.
+    """
+
+    # Busy percentage of a core not seen in /proc/stat yet
+    BUSY_UNKNOWN = 255
+    # Load jitters by a point or two on every tick; smaller moves than
+    # this do not count as a change
+    BUSY_CHANGE_THRESHOLD = 5
+
+    def __init__(self, reader, on_change,
+                 interval_ms=DEFAULT_SAMPLE_INTERVAL_MS, stat=None,
+                 thermal=None):
+        self._reader = reader
+        self._on_change = on_change
+        self._interval_ms = interval_ms
+        self._stat = stat
+        self._thermal = thermal
+        self._cpu_ids = []
+        self._paths = []
+        self._cur_khz = []
+        self._governors = []
+        self._busy = bytearray()
+        self._changed_at = []
+        self._generation = 0
+        self._reset_generation = 0
+        self._timer_id = None
+
+    def set_cores(self, cores):
+        """Set the cores to sample as (cpu_id, governor_path, cur_path).
+
+        Starts a new generation; clients older than it get a full update.
+        """
+        self._cpu_ids = [cpu_id for cpu_id, _gov, _cur in cores]
+        self._paths = [(gov, cur) for _cpu_id, gov, cur in cores]
+        count = len(self._paths)
+        self._cur_khz = [None] * count
+        self._governors = [None] * count
+        self._busy = bytearray([self.BUSY_UNKNOWN]) * count
+        self._changed_at = [0] * count
+        self._generation += 1
+        self._reset_generation = self._generation
+
+    @property
+    def generation(self):
+        """The generation of the most recent change."""
+        return self._generation
+
+    @property
+    def running(self):
+        """Whether the sampling timer is armed."""
+        return self._timer_id is not None
+
+    def set_interval(self, interval_ms):
+        """Change the sampling interval, re-arming a running timer."""
+        if interval_ms == self._interval_ms:
+            return
+        self._interval_ms = interval_ms
+        if self.running:
+            self.stop()
+            self.start()
+
+    def start(self):
+        """Start periodic sampling."""
+        if self._timer_id is None:
+            self._timer_id = GLib.timeout_add(self._interval_ms, self._on_tick)
+
+    def stop(self):
+        """Stop periodic sampling."""
+        if self._timer_id is not None:
+            GLib.source_remove(self._timer_id)
+            self._timer_id = None
+
+    def poll(self, notify=True):
+        """Read every core once and record which ones changed.
+
+        Returns True if any core's frequency or governor differs from
+        the previous read, or its busy percentage moved by at least
+        BUSY_CHANGE_THRESHOLD points since it was last recorded, and then
+        also calls on_change(since, generation) unless notify is False.
+        """
+        read = self._reader.read
+        since = self._generation
+        generation = since + 1
+        changed = False
+        load = ()
+        if self._stat is not None and self._stat.sample() is not None:
+            load = self._stat.busy
+        # Temperatures are kept for queries, not change detection
+        if self._thermal is not None:
+            self._thermal.read()
+        for i, (governor_path, cur_freq_path) in enumerate(self._paths):
+            try:
+                cur = int(read(cur_freq_path))
+            except ValueError:
+                cur = 0
+            governor = read(governor_path)
+            cpu_id = self._cpu_ids[i]
+            busy = self.BUSY_UNKNOWN
+            if cpu_id < len(load) and load[cpu_id] >= 0:
+                busy = int(load[cpu_id] + 0.5)
+            last_busy = self._busy[i]
+            if busy == last_busy:
+                busy_changed = False
+            elif self.BUSY_UNKNOWN in (busy, last_busy):
+                busy_changed = True
+            else:
+                busy_changed = (abs(busy - last_busy)
+                                >= self.BUSY_CHANGE_THRESHOLD)
+            if (cur != self._cur_khz[i] or governor != self._governors[i]
+                    or busy_changed):
+                self._cur_khz[i] = cur
+                self._governors[i] = governor
+                self._busy[i] = busy
+                self._changed_at[i] = generation
+                changed = True
+
+        if changed:
+            self._generation = generation
+            if notify:
+                self._on_change(since, generation)
+        return changed
+
+    def columns(self, since=0):
+        """Return the cores that changed after generation since.
+
+        Returns (full, cpu_ids, cur_khz, governor_index, governor_table,
+        busy). busy holds whole percentages, BUSY_UNKNOWN where there is
+        no sample yet. full is True, and every core is included, when
+        since predates the current set of cores or comes from another
+        daemon instance.
+        """
+        full = (since <= self._reset_generation
+                or since > self._generation)
+        if full:
+            indices = range(len(self._paths))
+        else:
+            indices = [i for i, changed_at in enumerate(self._changed_at)
+                       if changed_at > since]
+
+        cpu_ids = []
+        cur_khz = []
+        governor_index = bytearray()
+        governor_table = []
+        busy = bytearray()
+        table_index = {}
+        for i in indices:
+            cpu_ids.append(self._cpu_ids[i])
+            cur_khz.append(self._cur_khz[i] or 0)
+            busy.append(self._busy[i])
+            governor = self._governors[i] or ""
+            index = table_index.get(governor)
+            if index is None:
+                index = table_index[governor] = len(governor_table)
+                governor_table.append(governor)
+            governor_index.append(index)
+        return full, cpu_ids, cur_khz, governor_index, governor_table, busy
+
+    @property
+    def cur_khz(self):
+        """Current frequencies, in set_cores() order; None before a poll."""
+        return self._cur_khz
+
+    @property
+    def governors(self):
+        """Governors, in set_cores() order; None before a poll."""
+        return self._governors
+
+    @property
+    def busy(self):
+        """Busy percentages as last recorded, in set_cores() order.
+
+        A value is only updated once it moved by BUSY_CHANGE_THRESHOLD
+        points, or along with a change of frequency or governor.
+        """
+        return self._busy
+
+    def _on_tick(self):
+        self.poll()
+        return True
+
+
+class ProcStatSampler:
+    """Incremental CPU utilization from /proc/stat.
+
+    Each sample() is a single pread of the cpu lines into a preallocated
+    buffer. The previous busy and total jiffies of the aggregate (slot 0)
+    and of every CPU (slot cpu + 1) are kept in flat arrays, so busy
+    percentages cover the time since the previous sample.
+    """
+
+    # user nice system idle iowait irq softirq steal; guest time is
+    # already counted in user and nice
+    FIELDS = 8
+
+    def __init__(self, path=PROC_STAT_PATH):
+        self._path = path
+        self._fd = None
+        self._buffer = bytearray(PROC_STAT_READ_SIZE)
+        self._prev_busy = array.array("Q")
+        self._prev_total = array.array("Q")
+        # Busy percent per CPU number, -1.0 when unknown or offline
+        self.busy = array.array("d")
+        self.load = None
+        self.max_busy = None
+
+    def sample(self):
+        """Read /proc/stat once and update the busy percentages.
+
+        Returns (aggregate_percent, busiest_cpu_percent), or None on the
+        first call, which only records the baseline, and on read errors.
+        """
+        data = self._read()
+        if data is None:
+            return None
+
+        busy = self.busy
+        seen = bytearray(len(busy))
+        load = None
+        for line in data.split(b"\n"):
+            if not line.startswith(b"cpu"):
+                break
+            fields = line.split()
+            name = fields[0]
+            slot = 0 if name == b"cpu" else int(name[3:]) + 1
+            values = [int(value) for value in fields[1:1 + self.FIELDS]]
+            total = sum(values)
+            # idle + iowait
+            cpu_busy = total - values[3] - values[4]
+
+            if slot >= len(self._prev_total):
+                grow = slot + 1 - len(self._prev_total)
+                self._prev_busy.extend([0] * grow)
+                self._prev_total.extend([0] * grow)
+            if slot > len(busy):
+                seen.extend(bytes(slot - len(busy)))
+                busy.extend([-1.0] * (slot - len(busy)))
+            if slot:
+                seen[slot - 1] = 1
+
+            # No tick since the last sample: keep the previous value
+            delta_total = total - self._prev_total[slot]
+            if delta_total <= 0:
+                if slot == 0:
+                    load = self.load
+                continue
+            percent = -1.0
+            if self._prev_total[slot]:
+                percent = 100.0 * (cpu_busy - self._prev_busy[slot]) / delta_total
+                # iowait may go backwards (proc(5)), pushing this past 100%
+                percent = max(0.0, min(100.0, percent))
+            self._prev_busy[slot] = cpu_busy
+            self._prev_total[slot] = total
+
+            if slot == 0:
+                load = percent
+            else:
+                busy[slot - 1] = percent
+
+        # Offline CPUs have no line
+        for i, present in enumerate(seen):
+            if not present:
+                busy[i] = -1.0
+
+        if load is None or load < 0:
+            return None
+        self.load = load
+        self.max_busy = max(max(busy, default=0.0), 0.0)
+        return self.load, self.max_busy
+
+    def close(self):
+        """Close the cached /proc/stat fd."""
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def _read(self):
+        """Return the cpu lines of /proc/stat, or None on errors."""
+        while True:
+            if self._fd is None:
+                try:
+                    self._fd = os.open(self._path, os.O_RDONLY | os.O_CLOEXEC)
+                except OSError:
+                    return None
+            try:
+                length = os.preadv(self._fd, [self._buffer], 0)
+            except OSError:
+                self.close()
+                return None
+
+            # The first line that is not a cpu line proves none was cut
+            data = bytes(self._buffer[:length])
+            if length < len(self._buffer) or b"\nintr" in data:
+                return data
+            self._buffer = bytearray(len(self._buffer) * 2)
+
+
+class LoadGovernor:
+    """Decide from /proc/stat load when to switch to a faster governor.
+
+    Engages once the aggregate load reaches up_threshold, or any core
+    reaches core_up_threshold, for up_dwell_s; disengages once both are
+    at or below their down thresholds for down_dwell_s. The gap between
+    the thresholds and the dwell times keep it from flapping.
+    on_switch(engaged, reason) is called on every decision.
+    """
+
+    def __init__(self, stat, on_switch, settings):
+        self._stat = stat
+        self._on_switch = on_switch
+        self.settings = settings
+        self.engaged = False
+        self.reason = "starting"
+        self.changed_at = time.time()
+        self._pending_since = None
+        self._timer_id = None
+
+    def start(self):
+        """Start sampling the load."""
+        if self._timer_id is None:
+            self._stat.sample()
+            self._timer_id = GLib.timeout_add(
+                int(self.settings["interval_ms"]), self._on_tick
+            )
+
+    def stop(self):
+        """Stop sampling the load."""
+        if self._timer_id is not None:
+            GLib.source_remove(self._timer_id)
+            self._timer_id = None
+
+    def update(self, load, max_busy, now):
+        """Feed one load sample taken at monotonic time now."""
+        settings = self.settings
+        if not self.engaged:
+            wanted = (load >= settings["up_threshold"]
+                      or max_busy >= settings["core_up_threshold"])
+            dwell = settings["up_dwell_s"]
+        else:
+            wanted = (load <= settings["down_threshold"]
+                      and max_busy <= settings["core_down_threshold"])
+            dwell = settings["down_dwell_s"]
+
+        if not wanted:
+            self._pending_since = None
+            return
+        if self._pending_since is None:
+            self._pending_since = now
+        if now - self._pending_since < dwell:
+            return
+
+        self._pending_since = None
+        self.engaged = not self.engaged
+        self.changed_at = time.time()
+        self.reason = (f"load {load:.0f}%, busiest core {max_busy:.0f}% "
+                       f"for {dwell:g}s")
+        self._on_switch(self.engaged, self.reason)
+
+    def _on_tick(self):
+        sample = self._stat.sample()
+        if sample is not None:
+            self.update(*sample, time.monotonic())
+        return True
+
+
+class Override:
+    """A temporary setting claimed by a daemon subsystem or a client.
+
+    settings holds any of governor, energy_preference, frequency_limits
+    ([min_khz, max_khz]) and boost. cpus limits it to the policies of
+    those CPUs; None means all of them.
+    """
+
+    _sequence = itertools.count()
+
+    def __init__(self, priority, settings, cpus=None):
+        self.priority = priority
+        self.settings = settings
+        self.cpus = frozenset(cpus) if cpus else None
+        self.sequence = next(self._sequence)
+
+    def covers(self, policy):
+        """Whether the override applies to a policy."""
+        return self.cpus is None or not self.cpus.isdisjoint(policy.cpus)
+
+
+class ThermalMonitor:
+    """Discover CPU temperature sensors once and read them per pass.
+
+    coretemp "Core N" sensors map to the CPUs with that core id in their
+    package; package sensors (coretemp "Package id N", k10temp Tdie or
+    Tctl, CPU thermal zones) map to every CPU of the package, when the
+    package can be told. Temperatures are in millidegrees Celsius.
+    """
+
+    def __init__(self, reader):
+        self._reader = reader
+        # (name, source, path, package or -1, cpu ids)
+        self.sensors = []
+        self.temps = array.array("l")
+        # cpu id -> index of its most specific sensor
+        self._cpu_sensor = {}
+
+    def discover(self, cpu_dirs):
+        """Find the sensors and map them to the CPUs in cpu_dirs."""
+        packages = {}
+        cores = {}
+        for cpu_dir in cpu_dirs:
+            cpu_id = int(os.path.basename(cpu_dir)[3:])
+            package = CPUGovDaemon._read_sysfs(
+                os.path.join(cpu_dir, TOPOLOGY_PACKAGE_PATH))
+            core = CPUGovDaemon._read_sysfs(
+                os.path.join(cpu_dir, TOPOLOGY_CORE_PATH))
+            package = int(package) if package.isdigit() else 0
+            packages.setdefault(package, []).append(cpu_id)
+            if core.isdigit():
+                cores.setdefault((package, int(core)), []).append(cpu_id)
+
+        sensors = []
+        # Lower rank wins when several sensors cover a CPU
+        ranked = []
+
+        k10temp = []
+        for hwmon in sorted(glob.glob(os.path.join(HWMON_BASE, "hwmon*"))):
+            driver = CPUGovDaemon._read_sysfs(os.path.join(hwmon, "name"))
+            if driver not in CPU_HWMON_DRIVERS:
+                continue
+            if driver == "k10temp":
+                k10temp.append(hwmon)
+                continue
+            # coretemp.N is the package's platform device
+            device = os.path.basename(os.path.realpath(
+                os.path.join(hwmon, "device")))
+            package = device.rpartition(".")[2]
+            package = int(package) if package.isdigit() else -1
+            for inp in sorted(glob.glob(os.path.join(hwmon, "temp*_input"))):
+                label = CPUGovDaemon._read_sysfs(
+                    inp[:-len("input")] + "label") or os.path.basename(inp)
+                if label.startswith("Package id "):
+                    package = int(label.split()[-1])
+                    cpus, rank = packages.get(package, []), 1
+                elif label.startswith("Core "):
+                    cpus = cores.get((package, int(label.split()[-1])), [])
+                    rank = 0
+                else:
+                    cpus, rank = [], 3
+                sensors.append((label, driver, inp, package, cpus))
+                ranked.append(rank)
+
+        # One k10temp per package, in order, unless the counts disagree
+        for index, hwmon in enumerate(k10temp):
+            package = index if len(k10temp) == len(packages) else -1
+            for inp in sorted(glob.glob(os.path.join(hwmon, "temp*_input"))):
+                label = CPUGovDaemon._read_sysfs(
+                    inp[:-len("input")] + "label") or os.path.basename(inp)
+                cpus = []
+                rank = 3
+                if label in ("Tdie", "Tctl") and package >= 0:
+                    cpus = packages.get(package, [])
+                    # Tctl may carry a fan-control offset
+                    rank = 1 if label == "Tdie" else 2
+                sensors.append((label, "k10temp", inp, package, cpus))
+                ranked.append(rank)
+
+        for zone in sorted(glob.glob(os.path.join(THERMAL_BASE,
+                                                  "thermal_zone*"))):
+            kind = CPUGovDaemon._read_sysfs(os.path.join(zone, "type"))
+            package = -1
+            cpus = []
+            if kind in CPU_THERMAL_ZONE_TYPES and len(packages) == 1:
+                package, cpus = next(iter(packages.items()))
+            sensors.append((kind, os.path.basename(zone),
+                            os.path.join(zone, "temp"), package, cpus))
+            ranked.append(2.5 if cpus else 3)
+
+        cpu_sensor = {}
+        cpu_rank = {}
+        for index, (sensor, rank) in enumerate(zip(sensors, ranked)):
+            for cpu_id in sensor[4]:
+                if rank < cpu_rank.get(cpu_id, 3):
+                    cpu_rank[cpu_id] = rank
+                    cpu_sensor[cpu_id] = index
+
+        for _name, _source, path, _package, _cpus in self.sensors:
+            self._reader.close(path)
+        self.sensors = sensors
+        self.temps = array.array("l", [0] * len(sensors))
+        self._cpu_sensor = cpu_sensor
+
+    def read(self):
+        """Read every sensor once."""
+        read = self._reader.read
+        temps = self.temps
+        for i, sensor in enumerate(self.sensors):
+            try:
+                temps[i] = int(read(sensor[2]))
+            except ValueError:
+                temps[i] = 0
+
+    def cpu_temperature(self, cpu_id):
+        """Return a CPU's last temperature in millidegrees, or None."""
+        index = self._cpu_sensor.get(cpu_id)
+        if index is None or not self.temps[index]:
+            return None
+        return self.temps[index]
+
+
+class PrivilegedRequest:
+    """A queued request waiting for Polkit before it is applied."""
+
+    PENDING = "pending"
+    AUTHORIZED = "authorized"
+    FAILED = "failed"
+
+    def __init__(self, sender, apply, reply_cb, error_cb):
+        self.sender = sender
+        self.apply = apply
+        self.reply_cb = reply_cb
+        self.error_cb = error_cb
+        self.state = self.PENDING
+        self.error = None
+        # Set while a Polkit check for the request is in flight
+        self.cancellation_id = None
 
 
 class CPUGovDaemon(dbus.service.Object):
     """D-Bus system service for CPU governor management."""
 
-    def __init__(self, bus):
-        bus_name = dbus.service.BusName(BUS_NAME, bus=bus)
-        super().__init__(bus_name, OBJECT_PATH)
-        self._bus = bus
-        # Restore saved governor on startup
-        self._restore_governor()
+    def __init__(self, bus):
+        bus_name = dbus.service.BusName(BUS_NAME, bus=bus)
+        super().__init__(bus_name, OBJECT_PATH)
+        self._bus = bus
+
+        # CPU topology is scanned once and refreshed on hotplug uevents
+        self._cpu_dirs = []
+        self._policies = []
+        self._topology_generation = 0
+        self._reader = SysfsReader()
+        self._writer = SysfsWriter(self._config_count("write_workers", 0))
+        self._static_info = None
+        self._default_interval_ms = self._config_interval_ms(
+            "sample_interval_ms", DEFAULT_SAMPLE_INTERVAL_MS
+        )
+        self._thermal = ThermalMonitor(self._reader)
+        self._sampler = FrequencySampler(
+            self._reader, self._emit_frequencies, self._default_interval_ms,
+            ProcStatSampler(), self._thermal,
+        )
+        # Unique bus name -> requested sample interval (ms)
+        self._subscribers = {}
+        # PrivilegedRequests in arrival order
+        self._privileged_queue = collections.deque()
+
+        # (sender, action_id) -> monotonic expiry of a positive answer
+        self._polkit_authority = None
+        self._polkit_cache = {}
+        self._polkit_cancellation_ids = itertools.count(1)
+        self._polkit_cache_ttl = self._config_seconds(
+            "polkit_cache_ttl_s", DEFAULT_POLKIT_CACHE_TTL_S
+        )
+        bus.add_signal_receiver(
+            self._on_polkit_changed,
+            signal_name="Changed",
+            dbus_interface="org.freedesktop.PolicyKit1.Authority",
+            path="/org/freedesktop/PolicyKit1/Authority",
+        )
+        self._refresh_topology()
+
+        # Override key -> Override; the baseline maps each attribute
+        # path an override changed to its value before, for settings
+        # that were never persisted
+        self._overrides = {}
+        self._override_baseline = {}
+        # True on AC, False on battery, None when unknown
+        self._on_ac = None
+
+        self._uevents = UeventMonitor()
+        self._uevents.add_handler("cpu", self._on_cpu_uevent)
+        self._uevents.add_handler("power_supply", self._on_power_supply_uevent)
+        if not self._uevents.start():
+            print("cpugov-daemon: CPU hotplug will not refresh the topology cache",
+                  file=sys.stderr)
+
+        # Drop per-client state when a client leaves the bus
+        bus.add_signal_receiver(
+            self._on_name_owner_changed,
+            signal_name="NameOwnerChanged",
+            dbus_interface="org.freedesktop.DBus",
+            bus_name="org.freedesktop.DBus",
+            path="/org/freedesktop/DBus",
+        )
+
+        # Restore saved governor and energy preference on startup; the
+        # preference goes second as some governors constrain it
+        self._restore_governor()
+        self._restore_energy_preference()
+        self._restore_frequency_limits()
+        self._restore_boost()
+        # The restores write persisted values; put overrides such as the
+        # power source profile back on top of them
+        if self._overrides:
+            self._reconcile_overrides()
+
+        self._auto = None
+        self._start_auto()
+
+        self._process_rules = []
+        # pid -> indices of the rules it matches
+        self._rule_matches = {}
+        self._process_monitor = None
+        self._process_scan_id = None
+        self._start_process_rules()
+
+        # Cookie -> (pidfd, watch id, pid, reason, owner)
+        self._holds = {}
+        self._hold_cookies = itertools.count(1)
+        # Lease id -> (owner, governor, timeout source id or None)
+        self._leases = {}
+        self._lease_ids = itertools.count(1)
+
+    # ── Topology ──────────────────────────────────────────────────
+
+    def _refresh_topology(self):
+        """Rescan sysfs and replace the cached CPU directory list."""
+        self._cpu_dirs = self._scan_cpu_dirs()
+        self._policies = self._scan_policies(self._cpu_dirs)
+        self._topology_generation += 1
+        # Cached fds may point at attributes of CPUs that went away
+        self._reader.reset()
+        self._thermal.discover(self._cpu_dirs)
+        # The baseline for since_ns = 0, and per client, monotonic ns ->
+        # residency snapshot of its earlier calls
+        self._residency_start = self._take_residency_snapshot()
+        self._residency_snapshots = {}
+        self._static_info = self._build_static_info()
+        self._sampler.set_cores([
+            (cpu_id, governor_path, cur_freq_path)
+            for cpu_id, (governor_path, cur_freq_path, _fields)
+            in zip(self._static_info["cpu_ids"], self._static_info["cores"])
+        ])
+
+    def _build_static_info(self):
+        """Precompute the parts of GetCpuInfo that only change on hotplug.
+
+        Returns the model, core count and online mask as ready-made D-Bus
+        variants, plus a (governor_path, cur_freq_path, fields) tuple per
+        core where fields holds the constant per-core variants.
+        """
+        cores = []
+        cpu_ids = []
+        min_khz = []
+        max_khz = []
+        for cpu_dir in self._cpu_dirs:
+            min_freq = self._read_sysfs(os.path.join(cpu_dir, MIN_FREQ_PATH))
+            max_freq = self._read_sysfs(os.path.join(cpu_dir, MAX_FREQ_PATH))
+            cpu_ids.append(int(os.path.basename(cpu_dir)[3:]))
+            min_khz.append(self._parse_khz(min_freq))
+            max_khz.append(self._parse_khz(max_freq))
+            cores.append((
+                os.path.join(cpu_dir, GOVERNOR_PATH),
+                os.path.join(cpu_dir, CUR_FREQ_PATH),
+                {
+                    "name": dbus.String(os.path.basename(cpu_dir),
+                                        variant_level=1),
+                    "min_freq_khz": dbus.String(min_freq, variant_level=1),
+                    "max_freq_khz": dbus.String(max_freq, variant_level=1),
+                },
+            ))
+
+        # Thread count (includes HT)
+        online_str = self._read_sysfs(os.path.join(SYSFS_CPU_BASE, "online"))
+        model = self._get_cpu_model()
+
+        return {
+            "model": dbus.String(model, variant_level=1),
+            "core_count": dbus.Int32(len(cores), variant_level=1),
+            "online": dbus.String(online_str, variant_level=1),
+            "cores": cores,
+            # Typed columns for GetCpuInfoV2
+            "v2_header": (dbus.String(model), dbus.UInt32(len(cores)),
+                          dbus.String(online_str)),
+            "cpu_ids": dbus.Array(cpu_ids, signature="u"),
+            "min_khz": dbus.Array(min_khz, signature="u"),
+            "max_khz": dbus.Array(max_khz, signature="u"),
+        }
+
+    @staticmethod
+    def _parse_khz(value):
+        """Parse a kHz sysfs value, mapping unreadable values to 0."""
+        try:
+            return int(value)
+        except ValueError:
+            return 0
+
+    def _on_cpu_uevent(self, event):
+        """Refresh the topology cache when a CPU goes online or offline."""
+        if event.get("ACTION") not in ("online", "offline", "add", "remove"):
+            return
+        self._refresh_topology()
+        print(f"cpugov-daemon: CPU topology changed "
+              f"({event.get('ACTION')} {event.get('DEVPATH', '?')}), "
+              f"{len(self._cpu_dirs)} CPUs with cpufreq",
+              file=sys.stderr)
+
+    def _get_cpu_dirs(self):
+        """Return the cached sorted list of cpu directories with cpufreq."""
+        return self._cpu_dirs
+
+    # ── Clients ───────────────────────────────────────────────────
+
+    def _on_name_owner_changed(self, name, old_owner, new_owner):
+        """Forget a client once its bus connection goes away."""
+        if not new_owner and name.startswith(":"):
+            self._forget_client(name)
+
+    def _forget_client(self, sender):
+        """Release everything held on behalf of a disconnected client."""
+        for key in [key for key in self._polkit_cache if key[0] == sender]:
+            del self._polkit_cache[key]
+        self._drop_privileged_requests(sender)
+        if self._subscribers.pop(sender, None) is not None:
+            self._update_sampler()
+        self._residency_snapshots.pop(sender, None)
+        for lease_id in [lease_id for lease_id, lease in self._leases.items()
+                         if lease[0] == sender]:
+            self._drop_lease(lease_id, f"{sender} left the bus")
+
+    def _update_sampler(self):
+        """Run the sampler at the fastest subscribed rate, or not at all."""
+        if not self._subscribers:
+            if self._sampler.running:
+                self._sampler.stop()
+                print("cpugov-daemon: no subscribers, sampler stopped",
+                      file=sys.stderr)
+            return
+        self._sampler.set_interval(min(self._subscribers.values()))
+        self._sampler.start()
+
+    def _emit_frequencies(self, since, generation):
+        """Broadcast the cores that changed in a sampler pass."""
+        if not self._subscribers:
+            return
+        self.FrequenciesUpdated(
+            dbus.UInt64(since),
+            dbus.UInt64(generation),
+            *self._frequency_columns(since),
+        )
+
+    def _refresh_sampler(self):
+        """Bring the sampler's values up to date for a query.
+
+        While it runs its values are at most one interval old and are
+        served as they are; otherwise it is polled without broadcasting,
+        as nobody is subscribed.
+        """
+        if not self._sampler.running:
+            self._sampler.poll(notify=False)
+
+    def _frequency_columns(self, since):
+        """Return sampler columns changed after since as D-Bus values."""
+        full, cpu_ids, cur_khz, governor_index, governor_table, busy = \
+            self._sampler.columns(since)
+        return (
+            dbus.Boolean(full),
+            dbus.Array(cpu_ids, signature="u"),
+            dbus.Array(cur_khz, signature="u"),
+            dbus.ByteArray(bytes(governor_index)),
+            dbus.Array(governor_table, signature="s"),
+            dbus.ByteArray(bytes(busy)),
+        )
+
+    # ── Helper methods ────────────────────────────────────────────
+
+    @staticmethod
+    def _scan_cpu_dirs():
+        """Scan sysfs for cpu directories that have cpufreq."""
+        pattern = os.path.join(SYSFS_CPU_BASE, "cpu[0-9]*")
+        dirs = sorted(glob.glob(pattern),
+                      key=lambda d: int(os.path.basename(d)[3:]))
+        return [d for d in dirs
+                if os.path.exists(os.path.join(d, GOVERNOR_PATH))]
+
+    @staticmethod
+    def _scan_policies(cpu_dirs):
+        """Scan the cpufreq policies and the online CPUs each one drives.
+
+        Falls back to one policy per CPU (cpuN/cpufreq) on kernels without
+        cpufreq/policyN directories.
+        """
+        paths = sorted(glob.glob(os.path.join(SYSFS_CPU_BASE, POLICY_GLOB)),
+                       key=lambda p: int(os.path.basename(p)[6:]))
+        policies = []
+        for path in paths:
+            if not os.path.exists(os.path.join(path, POLICY_GOVERNOR)):
+                continue
+            affected = CPUGovDaemon._read_sysfs(
+                os.path.join(path, POLICY_AFFECTED_CPUS)
+            )
+            try:
+                cpus = [int(cpu) for cpu in affected.split()]
+            except ValueError:
+                continue
+            # A policy whose CPUs are all offline has nothing to drive
+            if cpus:
+                policies.append(CpufreqPolicy(path, cpus))
+        if policies:
+            return policies
+
+        return [CpufreqPolicy(os.path.join(cpu_dir, "cpufreq"),
+                              [int(os.path.basename(cpu_dir)[3:])])
+                for cpu_dir in cpu_dirs]
+
+    @staticmethod
+    def _read_sysfs(path):
+        """Read a sysfs file and return stripped content."""
+        try:
+            with open(path, "r") as f:
+                return f.read().strip()
+        except (IOError, OSError):
+            return ""
+
+    def _begin_transaction(self):
+        """Start an all-or-nothing batch of sysfs writes."""
+        return SysfsTransaction(self._reader, self._writer)
+
+    def _rollback(self, transaction):
+        """Roll a failed transaction back, logging what could not be undone."""
+        failures = transaction.rollback()
+        for path, e in failures:
+            print(f"cpugov-daemon: rollback of {path} failed: {e}",
+                  file=sys.stderr)
+
+    def _policies_for_cpus(self, cpus, strict=True):
+        """Return the cpufreq policies that drive the given CPUs.
+
+        A policy is only returned if all of its CPUs are in the set. In
+        strict mode, CPUs without a policy or sharing one with CPUs outside
+        the set raise InvalidCpus; otherwise they are skipped.
+        """
+        wanted = set(cpus)
+        if strict and not wanted:
+            raise dbus.exceptions.DBusException(
+                "No CPUs given",
+                name="io.github.serverket.cpugov.Error.InvalidCpus"
+            )
+
+        policies = []
+        seen = set()
+        for policy in self._policies:
+            overlap = wanted.intersection(policy.cpus)
+            if not overlap:
+                continue
+            seen.update(overlap)
+            if len(overlap) == len(policy.cpus):
+                policies.append(policy)
+            elif strict:
+                others = set(policy.cpus) - wanted
+                raise dbus.exceptions.DBusException(
+                    f"CPUs {format_cpu_list(overlap)} share a cpufreq policy "
+                    f"with CPUs {format_cpu_list(others)}; include them too",
+                    name="io.github.serverket.cpugov.Error.InvalidCpus"
+                )
+
+        unknown = wanted - seen
+        if strict and unknown:
+            raise dbus.exceptions.DBusException(
+                f"No cpufreq policy for CPUs {format_cpu_list(unknown)}",
+                name="io.github.serverket.cpugov.Error.InvalidCpus"
+            )
+        return policies
+
+    @staticmethod
+    def _write_policies(transaction, policies, attr, value):
+        """Write one attribute once per policy within a transaction.
+
+        Policies already holding the value are skipped. Returns a list of
+        (policy, error) for the writes that failed.
+        """
+        by_path = {policy.attr(attr): policy for policy in policies}
+        failures = transaction.apply([(path, value) for path in by_path])
+        return [(by_path[path], e) for path, e in failures]
+
+    @staticmethod
+    def _format_policy_failures(failures):
+        """Describe failed (policy, error) writes by CPU for messages."""
+        return ", ".join(
+            f"CPUs {format_cpu_list(policy.cpus)} ({e.strerror or e})"
+            for policy, e in failures
+        )
+
+    def _on_polkit_changed(self):
+        """Drop cached decisions when Polkit's rules or sessions change."""
+        self._polkit_cache.clear()
+
+    def _get_polkit_authority(self):
+        """Return a (cached) proxy for the Polkit authority."""
+        if self._polkit_authority is None:
+            proxy = self._bus.get_object(
+                "org.freedesktop.PolicyKit1",
+                "/org/freedesktop/PolicyKit1/Authority",
+                introspect=False,
+                follow_name_owner_changes=True,
+            )
+            self._polkit_authority = dbus.Interface(
+                proxy,
+                "org.freedesktop.PolicyKit1.Authority"
+            )
+        return self._polkit_authority
+
+    def _check_polkit_auth(self, sender, action_id, on_authorized, on_error):
+        """Check Polkit authorization for the calling process.
+
+        The check runs asynchronously so the main loop keeps serving other
+        clients while an authentication dialog is open. Exactly one of
+        on_authorized() or on_error(exception) is called. Positive answers
+        are reused for the same sender and action until they expire.
+
+        Returns the cancellation id of the check in flight, or None when
+        it was answered from the cache. A check that times out is
+        cancelled so its dialog does not outlive it.
+        """
+        key = (sender, action_id)
+        expiry = self._polkit_cache.get(key)
+        if expiry is not None:
+            if time.monotonic() < expiry:
+                on_authorized()
+                return None
+            del self._polkit_cache[key]
+
+        authority = self._get_polkit_authority()
+
+        subject = (
+            "system-bus-name",
+            {"name": dbus.String(sender, variant_level=1)}
+        )
+
+        def on_reply(result):
+            is_authorized = result[0]
+            if is_authorized:
+                if self._polkit_cache_ttl > 0:
+                    self._polkit_cache[key] = (time.monotonic()
+                                               + self._polkit_cache_ttl)
+                on_authorized()
+            else:
+                on_error(dbus.exceptions.DBusException(
+                    f"Not authorized for action: {action_id}",
+                    name="org.freedesktop.PolicyKit1.Error.NotAuthorized"
+                ))
+
+        cancellation_id = f"cpugov-{next(self._polkit_cancellation_ids)}"
+
+        def on_check_error(error):
+            if error.get_dbus_name() == "org.freedesktop.DBus.Error.NoReply":
+                self._cancel_polkit_check(cancellation_id)
+            on_error(error)
+
+        authority.CheckAuthorization(
+            subject,
+            action_id,
+            {},  # details
+            dbus.UInt32(1),  # AllowUserInteraction
+            cancellation_id,
+            reply_handler=on_reply,
+            error_handler=on_check_error,
+            timeout=POLKIT_TIMEOUT_S,
+        )
+        return cancellation_id
+
+    def _cancel_polkit_check(self, cancellation_id):
+        """Ask Polkit to abandon a check and close its dialog."""
+        def on_error(error):
+            print(f"cpugov-daemon: failed to cancel Polkit check "
+                  f"{cancellation_id}: {error}",
+                  file=sys.stderr)
+
+        self._get_polkit_authority().CancelCheckAuthorization(
+            cancellation_id,
+            reply_handler=lambda: None,
+            error_handler=on_error,
+        )
+
+    def _queue_privileged(self, sender, action_id, apply, reply_cb, error_cb):
+        """Authorize a privileged request and apply it in arrival order.
+
+        Authorizations for queued requests run concurrently, but apply()
+        is only called once every earlier request has been applied or
+        rejected. Its return value is sent with reply_cb; failures go to
+        error_cb.
+        """
+        request = PrivilegedRequest(sender, apply, reply_cb, error_cb)
+        self._privileged_queue.append(request)
+
+        # A request dropped in the meantime stays failed
+        def on_authorized():
+            if request.state == PrivilegedRequest.PENDING:
+                request.state = PrivilegedRequest.AUTHORIZED
+                request.cancellation_id = None
+                self._drain_privileged_queue()
+
+        def on_error(error):
+            if request.state == PrivilegedRequest.PENDING:
+                request.state = PrivilegedRequest.FAILED
+                request.error = error
+                request.cancellation_id = None
+                self._drain_privileged_queue()
+
+        try:
+            cancellation_id = self._check_polkit_auth(
+                sender, action_id, on_authorized, on_error
+            )
+        except dbus.exceptions.DBusException as e:
+            on_error(e)
+        else:
+            if request.state == PrivilegedRequest.PENDING:
+                request.cancellation_id = cancellation_id
+
+    def _drop_privileged_requests(self, sender):
+        """Fail a departed client's requests that still await Polkit.
+
+        Their authentication dialogs are cancelled, so requests queued
+        behind them do not wait for an answer nobody will use.
+        """
+        dropped = False
+        for request in self._privileged_queue:
+            if (request.sender != sender
+                    or request.state != PrivilegedRequest.PENDING):
+                continue
+            if request.cancellation_id is not None:
+                self._cancel_polkit_check(request.cancellation_id)
+                request.cancellation_id = None
+            request.state = PrivilegedRequest.FAILED
+            request.error = dbus.exceptions.DBusException(
+                f"{sender} left the bus",
+                name="org.freedesktop.PolicyKit1.Error.Cancelled"
+            )
+            dropped = True
+        if dropped:
+            self._drain_privileged_queue()
+
+    def _drain_privileged_queue(self):
+        """Apply or reject requests from the head of the queue."""
+        queue = self._privileged_queue
+        while queue and queue[0].state != PrivilegedRequest.PENDING:
+            request = queue.popleft()
+            if request.state == PrivilegedRequest.FAILED:
+                request.error_cb(request.error)
+                continue
+            try:
+                result = request.apply()
+            except dbus.exceptions.DBusException as e:
+                request.error_cb(e)
+            except (IOError, OSError) as e:
+                request.error_cb(dbus.exceptions.DBusException(
+                    str(e),
+                    name="io.github.serverket.cpugov.Error.WriteFailed"
+                ))
+            else:
+                request.reply_cb(result)
+
+    def _get_cpu_model(self):
+        """Read CPU model from /proc/cpuinfo."""
+        try:
+            with open(CPU_MODEL_PATH, "r") as f:
+                for line in f:
+                    if line.startswith("model name"):
+                        return line.split(":", 1)[1].strip()
+        except (IOError, OSError):
+            pass
+        return "Unknown"
+
+    def _load_config(self):
+        """Load the persisted config, or an empty one if there is none."""
+        try:
+            with open(CONFIG_PATH, "r") as f:
+                config = json.load(f)
+        except (IOError, OSError, json.JSONDecodeError):
+            return {}
+        return config if isinstance(config, dict) else {}
+
+    def _update_config(self, **changes):
+        """Merge changes into the config file, keeping all other keys."""
+        config = self._load_config()
+        config.update(changes)
+        try:
+            os.makedirs(os.path.dirname(CONFIG_PATH), exist_ok=True)
+            with open(CONFIG_PATH, "w") as f:
+                json.dump(config, f, indent=2)
+                f.write("\n")
+        except (IOError, OSError) as e:
+            print(f"cpugov-daemon: failed to save config: {e}",
+                  file=sys.stderr)
+            return False
+        return True
+
+    def _config_seconds(self, key, default):
+        """Read a non-negative duration in seconds from the config file."""
+        try:
+            value = float(self._load_config().get(key, default))
+        except (TypeError, ValueError):
+            return default
+        return max(value, 0.0)
+
+    def _config_count(self, key, default):
+        """Read a non-negative integer from the config file."""
+        try:
+            value = int(self._load_config().get(key, default))
+        except (TypeError, ValueError):
+            return default
+        return max(value, 0)
+
+    def _config_interval_ms(self, key, default):
+        """Read a positive millisecond interval from the config file."""
+        try:
+            value = int(self._load_config().get(key, default))
+        except (TypeError, ValueError):
+            return default
+        return max(value, MIN_SAMPLE_INTERVAL_MS)
+
+    def _restore_governor(self):
+        """Restore the saved governor and per-CPU governors on startup.
+
+        The profile for the current power source is then applied on top,
+        so the boot-time state matches it.
+        """
+        self._restore_policy_setting(
+            "governor", "cpu_governors", POLICY_GOVERNOR, "governor",
+            self.GetAvailableGovernors(),
+        )
+        self._update_power_source()
+
+    def _restore_energy_preference(self):
+        """Restore the saved energy preferences on startup."""
+        self._restore_policy_setting(
+            "energy_preference", "cpu_energy_preferences", POLICY_EPP,
+            "energy preference", self.GetAvailableEnergyPreferences(),
+        )
+
+    def _restore_frequency_limits(self):
+        """Restore the saved scaling frequency limits on startup."""
+        config = self._load_config()
+        saved = config.get("frequency_limits")
+        per_cpu = config.get("cpu_frequency_limits") or {}
+
+        targets = []
+        if saved:
+            targets.append((saved, None))
+        by_value = {}
+        for cpu, limits in per_cpu.items():
+            try:
+                by_value.setdefault(tuple(limits), []).append(int(cpu))
+            except (TypeError, ValueError):
+                continue
+        targets.extend(by_value.items())
+
+        for limits, cpus in targets:
+            where = "" if cpus is None else f" for CPUs {format_cpu_list(cpus)}"
+            if cpus is None:
+                policies = self._policies
+            else:
+                policies = self._policies_for_cpus(cpus, strict=False)
+            try:
+                min_khz, max_khz = (int(khz) for khz in limits)
+                resolved = self._resolve_frequency_limits(
+                    policies, min_khz, max_khz
+                )
+            except (TypeError, ValueError,
+                    dbus.exceptions.DBusException) as e:
+                print(f"cpugov-daemon: saved frequency limits {limits}{where} "
+                      f"not applicable, skipping: {e}",
+                      file=sys.stderr)
+                continue
+
+            # Keep whatever succeeded
+            failures = self._write_frequency_limits(
+                self._begin_transaction(), resolved
+            )
+            if failures:
+                print(f"cpugov-daemon: failed to restore frequency limits on "
+                      f"{self._format_policy_failures(failures)}",
+                      file=sys.stderr)
+
+            print(f"cpugov-daemon: restored frequency limits "
+                  f"{min_khz}-{max_khz} kHz{where} from {CONFIG_PATH}",
+                  file=sys.stderr)
+
+    def _restore_boost(self):
+        """Restore the saved turbo/boost setting on startup."""
+        saved = self._load_config().get("boost")
+        if saved is None:
+            return
+        if self._boost_interface() is None:
+            print("cpugov-daemon: saved boost setting ignored, "
+                  "no boost interface found",
+                  file=sys.stderr)
+            return
+
+        failures = self._write_boost(self._begin_transaction(), bool(saved))
+        if failures:
+            print(f"cpugov-daemon: failed to restore boost: "
+                  f"{', '.join(f'{path} ({e})' for path, e in failures)}",
+                  file=sys.stderr)
+            return
+        print(f"cpugov-daemon: restored boost {'on' if saved else 'off'} "
+              f"from {CONFIG_PATH}",
+              file=sys.stderr)
+
+    # ── Policy settings ───────────────────────────────────────────
+
+    def _apply_policy_setting(self, attr, label, value, policies):
+        """Write an authorized value to some policies, all-or-nothing.
+
+        On any failure every policy already changed is put back on its
+        previous value rather than leave the host mixed.
+        """
+        transaction = self._begin_transaction()
+        failures = self._write_policies(transaction, policies, attr, value)
+        if failures:
+            self._rollback(transaction)
+            raise dbus.exceptions.DBusException(
+                f"Failed to set {label} '{value}' on "
+                f"{self._format_policy_failures(failures)}; "
+                f"previous values restored",
+                name="io.github.serverket.cpugov.Error.WriteFailed"
+            )
+
+    def _policy_setting_changes(self, key, cpu_key, value, cpus=None):
+        """Return the config changes that persist a policy setting.
+
+        A value for all CPUs (cpus=None) replaces the saved per-CPU ones.
+        """
+        if cpus is None:
+            return {key: value, cpu_key: {}}
+        per_cpu = dict(self._load_config().get(cpu_key) or {})
+        per_cpu.update({str(cpu): value for cpu in cpus})
+        return {cpu_key: per_cpu}
+
+    def _save_policy_setting(self, key, cpu_key, label, value, cpus=None):
+        """Persist a policy setting for all CPUs or for some of them."""
+        saved = self._update_config(
+            **self._policy_setting_changes(key, cpu_key, value, cpus)
+        )
+        target = "" if cpus is None else f" for CPUs {format_cpu_list(cpus)}"
+        if saved:
+            print(f"cpugov-daemon: saved {label} '{value}'{target} "
+                  f"to {CONFIG_PATH}",
+                  file=sys.stderr)
+        self._clear_active_profile()
+
+    def _restore_policy_setting(self, key, cpu_key, attr, label, available):
+        """Reapply a saved policy setting and its per-CPU overrides."""
+        config = self._load_config()
+        saved = config.get(key)
+        per_cpu = config.get(cpu_key) or {}
+        if not saved and not per_cpu:
+            return
+
+        # Group per-CPU overrides by value; they are applied after the
+        # value for all CPUs
+        targets = []
+        if saved:
+            targets.append((saved, None))
+        by_value = {}
+        for cpu, value in per_cpu.items():
+            try:
+                by_value.setdefault(value, []).append(int(cpu))
+            except ValueError:
+                continue
+        targets.extend(by_value.items())
+
+        for value, cpus in targets:
+            where = "" if cpus is None else f" for CPUs {format_cpu_list(cpus)}"
+            # Validate it's still available
+            if value not in available:
+                print(f"cpugov-daemon: saved {label} '{value}'{where} "
+                      f"no longer available, skipping",
+                      file=sys.stderr)
+                continue
+
+            if cpus is None:
+                policies = self._policies
+            else:
+                policies = self._policies_for_cpus(cpus, strict=False)
+
+            # Apply once per policy, keeping whatever succeeded
+            failures = self._write_policies(
+                self._begin_transaction(), policies, attr, value
+            )
+            if failures:
+                print(f"cpugov-daemon: failed to restore {label} on "
+                      f"{self._format_policy_failures(failures)}",
+                      file=sys.stderr)
+
+            print(f"cpugov-daemon: restored {label} '{value}'{where} "
+                  f"from {CONFIG_PATH}",
+                  file=sys.stderr)
+
+    # ── Overrides ─────────────────────────────────────────────────
+
+    def _set_override(self, key, priority, settings, cpus=None):
+        """Claim temporary settings under key and apply the winners."""
+        self._overrides[key] = Override(priority, settings, cpus)
+        return self._reconcile_overrides()
+
+    def _clear_override(self, key):
+        """Drop the override under key, if any, and apply what is left."""
+        if self._overrides.pop(key, None) is not None:
+            self._reconcile_overrides()
+
+    def _defer_to_overrides(self, changes, description):
+        """Persist an explicit change and apply it under the overrides.
+
+        Returns None, having done nothing, when no override is active;
+        the caller then writes the change itself. Otherwise the change is
+        saved first and applied wherever no override wins, so holds,
+        leases, automatic switching and process rules keep their
+        settings, and the result says whether it took effect: False if
+        a remaining override sets any of the same settings. An explicit
+        change also ends the power source profile until the power source
+        changes. If the writes fail, the previous config and overrides
+        are put back.
+        """
+        if not self._overrides:
+            return None
+
+        changes = dict(changes)
+        changes.setdefault("profile", "")
+        previous = self._load_config()
+        if not self._update_config(**changes):
+            raise dbus.exceptions.DBusException(
+                f"Failed to save {description} to {CONFIG_PATH}",
+                name="io.github.serverket.cpugov.Error.WriteFailed"
+            )
+
+        power = self._overrides.pop("power", None)
+        if not self._reconcile_overrides():
+            self._update_config(**{key: previous.get(key) for key in changes})
+            if power is not None:
+                self._overrides["power"] = power
+            self._reconcile_overrides()
+            raise dbus.exceptions.DBusException(
+                f"Failed to apply {description}; previous values restored",
+                name="io.github.serverket.cpugov.Error.WriteFailed"
+            )
+
+        if changes["profile"] != (previous.get("profile") or ""):
+            self.ProfileChanged(changes["profile"])
+        print(f"cpugov-daemon: saved {description} to {CONFIG_PATH}",
+              file=sys.stderr)
+        if power is not None:
+            print("cpugov-daemon: power source profile suspended until "
+                  "the power source changes",
+                  file=sys.stderr)
+        settings = {OVERRIDE_SETTING_KEYS[key] for key in changes
+                    if key in OVERRIDE_SETTING_KEYS}
+        holding = sorted(
+            key for key, override in self._overrides.items()
+            if settings.intersection(override.settings)
+            # The performance governor pins the energy preference, too
+            or ("energy_preference" in settings
+                and override.settings.get("governor") == "performance")
+        )
+        if holding:
+            print(f"cpugov-daemon: active overrides ({', '.join(holding)}) "
+                  f"keep precedence over {description}",
+                  file=sys.stderr)
+        return not holding
+
+    def _profile_override(self, name):
+        """Return a profile's settings in the form overrides use."""
+        settings = self._resolve_profile(name)
+        if "frequency_limits" in settings:
+            settings["frequency_limits"] = settings["frequency_limits"][0]
+        return settings
+
+    @staticmethod
+    def _winning_setting(overrides, key):
+        """Return the value of key from the strongest override setting it."""
+        candidates = [o for o in overrides if key in o.settings]
+        if not candidates:
+            return None
+
+        def strength(override):
+            value = override.settings[key]
+            rank = (GOVERNOR_RANK.index(value)
+                    if key == "governor" and value in GOVERNOR_RANK else -1)
+            return override.priority, rank, override.sequence
+
+        return max(candidates, key=strength).settings[key]
+
+    @staticmethod
+    def _persisted_setting(config, key, cpu_key, policy):
+        """Return the saved value of a setting for a policy, if any."""
+        per_cpu = config.get(cpu_key) or {}
+        for cpu in policy.cpus:
+            if str(cpu) in per_cpu:
+                return per_cpu[str(cpu)]
+        return config.get(key)
+
+    def _override_target(self, path, winner, persisted, valid):
+        """Pick what an attribute should hold: the winning override,
+        else the persisted setting, else its value before overrides.
+        """
+        if winner is not None and valid(winner):
+            if path not in self._override_baseline:
+                self._override_baseline[path] = self._reader.read(path)
+            return winner
+        if persisted is not None and valid(persisted):
+            return persisted
+        return self._override_baseline.get(path) or None
+
+    def _reconcile_overrides(self):
+        """Bring sysfs in line with the active overrides.
+
+        Per policy, each setting comes from the strongest override that
+        covers it, otherwise from config.json, otherwise from the value
+        it had before an override changed it. Writes are all-or-nothing.
+        Settings applied this way are never persisted.
+        """
+        config = self._load_config()
+        governors = set(self.GetAvailableGovernors())
+        epps = set(self.GetAvailableEnergyPreferences())
+
+        governor_writes = []
+        epp_writes = []
+        limits = []
+        for policy in self._policies:
+            covering = [o for o in self._overrides.values()
+                        if o.covers(policy)]
+
+            path = policy.attr(POLICY_GOVERNOR)
+            governor = self._override_target(
+                path, self._winning_setting(covering, "governor"),
+                self._persisted_setting(config, "governor",
+                                        "cpu_governors", policy),
+                governors.__contains__,
+            )
+            if governor:
+                governor_writes.append((path, governor))
+
+            # intel_pstate pins the preference under the performance
+            # governor and restores it by itself afterwards, so only an
+            # override may write one then
+            epp = self._winning_setting(covering, "energy_preference")
+            if epps and (epp or governor != "performance"):
+                path = policy.attr(POLICY_EPP)
+                epp = self._override_target(
+                    path, epp,
+                    self._persisted_setting(config, "energy_preference",
+                                            "cpu_energy_preferences", policy),
+                    epps.__contains__,
+                )
+                if epp:
+                    epp_writes.append((path, epp))
+
+            resolved = self._override_limits(
+                policy, self._winning_setting(covering, "frequency_limits"),
+                self._persisted_setting(config, "frequency_limits",
+                                        "cpu_frequency_limits", policy),
+            )
+            if resolved:
+                limits.append(resolved)
+
+        before = (self.GetGovernor(), self.GetEnergyPreference(),
+                  self._read_boost())
+        transaction = self._begin_transaction()
+        failures = transaction.apply(governor_writes)
+        if not failures:
+            failures = transaction.apply(epp_writes)
+        if not failures:
+            failures = [(policy.path, e) for policy, e
+                        in self._write_frequency_limits(transaction, limits)]
+        if not failures and before[2] is not None:
+            boost = self._winning_setting(self._overrides.values(), "boost")
+            if boost is not None:
+                self._override_baseline.setdefault("boost", before[2])
+            elif isinstance(config.get("boost"), bool):
+                boost = config["boost"]
+            else:
+                boost = self._override_baseline.get("boost")
+            if boost is not None:
+                failures = self._write_boost(transaction, boost)
+        if failures:
+            self._rollback(transaction)
+            print(f"cpugov-daemon: failed to apply overrides: "
+                  f"{', '.join(f'{path} ({e})' for path, e in failures)}",
+                  file=sys.stderr)
+            return False
+
+        if not self._overrides:
+            self._override_baseline.clear()
+
+        after = (self.GetGovernor(), self.GetEnergyPreference(),
+                 self._read_boost())
+        if after[0] != before[0]:
+            self.GovernorChanged(after[0])
+        if after[1] != before[1]:
+            self.EnergyPreferenceChanged(after[1])
+        if after[2] != before[2]:
+            self.BoostChanged(after[2])
+        return True
+
+    def _override_limits(self, policy, winner, persisted):
+        """Like _override_target, for a policy's (min, max) limits.
+
+        Returns (policy, min_khz, max_khz) or None to leave them alone.
+        """
+        min_path = policy.attr(POLICY_MIN_FREQ)
+        max_path = policy.attr(POLICY_MAX_FREQ)
+        for limits in (winner, persisted):
+            if limits is None:
+                continue
+            try:
+                min_khz, max_khz = (int(khz) for khz in limits)
+                resolved = self._resolve_frequency_limits(
+                    [policy], min_khz, max_khz
+                )[0]
+            except (TypeError, ValueError, dbus.exceptions.DBusException):
+                continue
+            if limits is winner:
+                for path in (min_path, max_path):
+                    if path not in self._override_baseline:
+                        self._override_baseline[path] = self._reader.read(path)
+            return resolved
+
+        if min_path in self._override_baseline:
+            return (policy,
+                    self._parse_khz(self._override_baseline[min_path]),
+                    self._parse_khz(self._override_baseline[max_path]))
+        return None
+
+    # ── Power source ──────────────────────────────────────────────
+
+    @staticmethod
+    def _read_power_source():
+        """Return True on AC power, False on battery, None if unknown.
+
+        Any online mains/USB supply means AC. Without such supplies, a
+        discharging battery or UPS means battery.
+        """
+        online = []
+        discharging = []
+        for supply in sorted(glob.glob(os.path.join(POWER_SUPPLY_BASE, "*"))):
+            kind = CPUGovDaemon._read_sysfs(os.path.join(supply, "type"))
+            if kind in ("Battery", "UPS"):
+                status = CPUGovDaemon._read_sysfs(os.path.join(supply, "status"))
+                discharging.append(status == "Discharging")
+                continue
+            value = CPUGovDaemon._read_sysfs(os.path.join(supply, "online"))
+            if value:
+                online.append(value == "1")
+
+        if online:
+            return any(online)
+        if discharging:
+            return not any(discharging)
+        return None
+
+    def _on_power_supply_uevent(self, event):
+        """Re-evaluate the power source when a supply changes."""
+        self._update_power_source()
+
+    def _update_power_source(self):
+        """Apply the profile configured for the current power source.
+
+        "power_profiles": {"ac": ..., "battery": ...} in config.json
+        names the profiles; they are held as a low-priority override so
+        holds and automatic switching still win.
+        """
+        profiles = self._load_config().get("power_profiles")
+        if not isinstance(profiles, dict) or not profiles:
+            self._clear_override("power")
+            return
+
+        # Only a change of source reapplies the profile; an explicit
+        # change in between stays in effect until then
+        on_ac = self._read_power_source()
+        if on_ac == self._on_ac:
+            return
+        self._on_ac = on_ac
+
+        source = {True: "ac", False: "battery"}.get(on_ac)
+        name = profiles.get(source) if source else None
+        if not name:
+            self._clear_override("power")
+            return
+        try:
+            settings = self._profile_override(name)
+        except dbus.exceptions.DBusException as e:
+            print(f"cpugov-daemon: cannot apply {source} profile '{name}': "
+                  f"{e}",
+                  file=sys.stderr)
+            self._clear_override("power")
+            return
+
+        print(f"cpugov-daemon: on {'AC' if on_ac else 'battery'} power, "
+              f"applying profile '{name}'",
+              file=sys.stderr)
+        self._set_override("power", OVERRIDE_PRIORITY_POWER, settings)
+
+    # ── Process rules ─────────────────────────────────────────────
+
+    def _start_process_rules(self):
+        """Load "process_rules" from config.json and start matching.
+
+        Each rule matches by "comm", "exe" or "cgroup" (a cgroup v2
+        path, matching its subtree) and holds "profile", or the
+        performance governor, while any matching process is alive.
+        """
+        rules = self._load_config().get("process_rules") or []
+        for rule in rules if isinstance(rules, list) else ():
+            if not isinstance(rule, dict) or not any(
+                    rule.get(key) for key in ("comm", "exe", "cgroup")):
+                print(f"cpugov-daemon: ignoring process rule {rule!r}: "
+                      f"needs comm, exe or cgroup",
+                      file=sys.stderr)
+                continue
+            try:
+                if rule.get("profile"):
+                    settings = self._profile_override(rule["profile"])
+                else:
+                    self._validate_governor("performance")
+                    settings = {"governor": "performance"}
+            except dbus.exceptions.DBusException as e:
+                print(f"cpugov-daemon: ignoring process rule {rule!r}: {e}",
+                      file=sys.stderr)
+                continue
+            self._process_rules.append((rule, settings))
+        if not self._process_rules:
+            return
+
+        self._process_monitor = ProcessMonitor(
+            self._on_process_exec, self._on_process_exit,
+            self._scan_processes,
+        )
+        if not self._process_monitor.start():
+            self._process_monitor = None
+            interval = self._config_seconds(
+                "process_scan_interval_s", DEFAULT_PROCESS_SCAN_INTERVAL_S
+            )
+            print(f"cpugov-daemon: scanning /proc every {interval:g}s for "
+                  f"process rules instead",
+                  file=sys.stderr)
+            self._process_scan_id = GLib.timeout_add(
+                max(int(interval * 1000), MIN_SAMPLE_INTERVAL_MS),
+                self._on_process_scan_tick,
+            )
+        # Catch processes that were running before we started
+        self._scan_processes()
+
+    @staticmethod
+    def _process_identity(pid):
+        """Return (comm, exe, cgroup) of a process; "" where unreadable.
+
+        Reading the exe link of another user's process needs
+        CAP_SYS_PTRACE.
+        """
+        proc = f"/proc/{pid}"
+        comm = CPUGovDaemon._read_sysfs(os.path.join(proc, "comm"))
+        try:
+            exe = os.readlink(os.path.join(proc, "exe"))
+        except OSError:
+            exe = ""
+        if exe.endswith(" (deleted)"):
+            exe = exe[:-len(" (deleted)")]
+        cgroup = ""
+        for line in CPUGovDaemon._read_sysfs(
+                os.path.join(proc, "cgroup")).splitlines():
+            # The unified hierarchy is "0::/path"
+            if line.startswith("0::"):
+                cgroup = line[3:]
+        return comm, exe, cgroup
+
+    def _match_process(self, pid):
+        """Return the indices of the rules a process matches."""
+        comm, exe, cgroup = self._process_identity(pid)
+        if not comm:
+            return ()
+        matches = []
+        for index, (rule, _settings) in enumerate(self._process_rules):
+            if rule.get("comm") and rule["comm"][:15] != comm:
+                continue
+            if rule.get("exe") and rule["exe"] != exe:
+                continue
+            if rule.get("cgroup"):
+                prefix = rule["cgroup"].rstrip("/")
+                if cgroup != prefix and not cgroup.startswith(prefix + "/"):
+                    continue
+            matches.append(index)
+        return tuple(matches)
+
+    def _on_process_exec(self, pid):
+        """Match a process that just started a new program."""
+        matches = self._match_process(pid)
+        if matches == self._rule_matches.get(pid, ()):
+            return
+        if matches:
+            self._rule_matches[pid] = matches
+        else:
+            self._rule_matches.pop(pid, None)
+        self._update_rule_overrides()
+
+    def _on_process_exit(self, pid):
+        """Forget a process that exited."""
+        if self._rule_matches.pop(pid, None):
+            self._update_rule_overrides()
+
+    def _scan_processes(self):
+        """Rebuild the rule matches from a full /proc scan."""
+        matches = {}
+        for entry in os.listdir("/proc"):
+            if entry.isdigit():
+                found = self._match_process(int(entry))
+                if found:
+                    matches[int(entry)] = found
+        if matches != self._rule_matches:
+            self._rule_matches = matches
+            self._update_rule_overrides()
+
+    def _on_process_scan_tick(self):
+        self._scan_processes()
+        return True
+
+    def _update_rule_overrides(self):
+        """Hold the override of every rule with a live matching process."""
+        active = {index for found in self._rule_matches.values()
+                  for index in found}
+        changed = False
+        for index, (rule, settings) in enumerate(self._process_rules):
+            key = f"rule:{index}"
+            if index in active and key not in self._overrides:
+                pids = sorted(pid for pid, found in self._rule_matches.items()
+                              if index in found)
+                print(f"cpugov-daemon: process rule {rule!r} matched "
+                      f"pid {', '.join(map(str, pids))}, holding {settings}",
+                      file=sys.stderr)
+                self._overrides[key] = Override(OVERRIDE_PRIORITY_RULES,
+                                                settings)
+                changed = True
+            elif index not in active and key in self._overrides:
+                print(f"cpugov-daemon: process rule {rule!r} released",
+                      file=sys.stderr)
+                del self._overrides[key]
+                changed = True
+        if changed:
+            self._reconcile_overrides()
+
+    # ── Performance holds ─────────────────────────────────────────
+
+    @dbus.service.method(
+        INTERFACE_NAME,
+        in_signature="uass",
+        out_signature="u",
+        sender_keyword="sender",
+        async_callbacks=("reply_cb", "error_cb"),
+    )
+    def HoldPerformance(self, pid, cpus, reason, sender=None, reply_cb=None,
+                        error_cb=None):
+        """Keep CPUs at the performance governor while a process lives.
+
+        cpus holds CPU lists such as "0-3"; empty means every CPU. Holds
+        are released when the process exits or on Release(cookie), and
+        the previous settings return once no hold covers a CPU.
+        Requires Polkit authorization.
+        """
+        self._validate_governor("performance")
+        try:
+            wanted = set()
+            for cpu_list in cpus:
+                wanted.update(parse_cpu_list(cpu_list))
+        except ValueError as e:
+            raise dbus.exceptions.DBusException(
+                f"Invalid CPU list {list(map(str, cpus))}: {e}",
+                name="io.github.serverket.cpugov.Error.InvalidCpus"
+            )
+        unknown = wanted - set(self._static_info["cpu_ids"])
+        if unknown:
+            raise dbus.exceptions.DBusException(
+                f"No cpufreq policy for CPUs {format_cpu_list(unknown)}",
+                name="io.github.serverket.cpugov.Error.InvalidCpus"
+            )
+
+        # Pin the process now; the pid could be reused during auth
+        pid = int(pid)
+        try:
+            pidfd = os.pidfd_open(pid)
+        except AttributeError:
+            raise dbus.exceptions.DBusException(
+                "Process holds need pidfd_open (Python 3.9, Linux 5.3)",
+                name="io.github.serverket.cpugov.Error.NotSupported"
+            )
+        except OSError as e:
+            raise dbus.exceptions.DBusException(
+                f"Cannot watch process {pid}: {e.strerror or e}",
+                name="io.github.serverket.cpugov.Error.InvalidPid"
+            )
+
+        def on_error(error):
+            os.close(pidfd)
+            error_cb(error)
+
+        self._queue_privileged(
+            sender, POLKIT_ACTION_SET,
+            lambda: self._add_hold(pidfd, pid, sorted(wanted), str(reason),
+                                   sender),
+            reply_cb, on_error,
+        )
+
+    def _add_hold(self, pidfd, pid, cpus, reason, owner):
+        """Register an authorized hold and apply it."""
+        cookie = next(self._hold_cookies)
+        watch_id = GLib.io_add_watch(
+            pidfd, GLib.PRIORITY_DEFAULT, GLib.IO_IN | GLib.IO_HUP,
+            self._on_held_process_exit, cookie,
+        )
+        self._holds[cookie] = (pidfd, watch_id, pid, reason, owner)
+
+        where = f"CPUs {format_cpu_list(cpus)}" if cpus else "all CPUs"
+        if not self._set_override(f"hold:{cookie}", OVERRIDE_PRIORITY_HOLD,
+                                  {"governor": "performance"}, cpus):
+            # The request's error callback closes pidfd
+            del self._holds[cookie]
+            GLib.source_remove(watch_id)
+            self._clear_override(f"hold:{cookie}")
+            raise dbus.exceptions.DBusException(
+                f"Failed to switch {where} to performance",
+                name="io.github.serverket.cpugov.Error.WriteFailed"
+            )
+        print(f"cpugov-daemon: hold {cookie}: performance on {where} "
+              f"while pid {pid} lives ({reason or 'no reason given'})",
+              file=sys.stderr)
+        return dbus.UInt32(cookie)
+
+    def _on_held_process_exit(self, fd, condition, cookie):
+        """A pidfd became readable: the held process exited."""
+        if cookie in self._holds:
+            print(f"cpugov-daemon: hold {cookie}: pid "
+                  f"{self._holds[cookie][2]} exited",
+                  file=sys.stderr)
+            self._release_hold(cookie)
+        return False
+
+    def _release_hold(self, cookie):
+        """Drop a hold and restore what it covered."""
+        pidfd, watch_id, _pid, _reason, _owner = self._holds.pop(cookie)
+        GLib.source_remove(watch_id)
+        os.close(pidfd)
+        self._clear_override(f"hold:{cookie}")
+
+    @dbus.service.method(
+        INTERFACE_NAME,
+        in_signature="u",
+        out_signature="",
+        sender_keyword="sender",
+        async_callbacks=("reply_cb", "error_cb"),
+    )
+    def Release(self, cookie, sender=None, reply_cb=None, error_cb=None):
+        """Release a hold before its process exits.
+
+        The caller that created the hold may always release it; anyone
+        else needs Polkit authorization.
+        """
+        cookie = int(cookie)
+        if cookie not in self._holds:
+            raise dbus.exceptions.DBusException(
+                f"No hold with cookie {cookie}",
+                name="io.github.serverket.cpugov.Error.InvalidCookie"
+            )
+
+        def release():
+            # It may have been released while authorization was pending
+            if cookie in self._holds:
+                print(f"cpugov-daemon: hold {cookie} released by {sender}",
+                      file=sys.stderr)
+                self._release_hold(cookie)
+
+        if self._holds[cookie][4] == sender:
+            release()
+            reply_cb()
+            return
+        self._queue_privileged(sender, POLKIT_ACTION_SET, release,
+                               lambda _result: reply_cb(), error_cb)
+
+    # ── Leases ────────────────────────────────────────────────────
+
+    @dbus.service.method(
+        INTERFACE_NAME,
+        in_signature="su",
+        out_signature="s",
+        sender_keyword="sender",
+        async_callbacks=("reply_cb", "error_cb"),
+    )
+    def AcquireLease(self, governor, timeout_s, sender=None, reply_cb=None,
+                     error_cb=None):
+        """Hold a governor on all CPUs while the caller stays connected.
+
+        The lease ends when the caller's bus connection closes, after
+        timeout_s seconds (0 for no limit) or on ReleaseLease. Among
+        concurrent leases and holds the more performant governor wins;
+        without any, the persisted governor returns. Requires Polkit
+        authorization.
+        """
+        self._validate_governor(governor)
+        timeout_s = int(timeout_s)
+
+        self._queue_privileged(
+            sender, POLKIT_ACTION_SET,
+            lambda: self._add_lease(sender, str(governor), timeout_s),
+            reply_cb, error_cb,
+        )
+
+    def _add_lease(self, owner, governor, timeout_s):
+        """Register an authorized lease and apply it."""
+        # The caller may have left while authorization was pending
+        try:
+            connected = self._bus.name_has_owner(owner)
+        except dbus.exceptions.DBusException:
+            connected = False
+        if not connected:
+            raise dbus.exceptions.DBusException(
+                f"{owner} left the bus before the lease was granted",
+                name="io.github.serverket.cpugov.Error.InvalidLease"
+            )
+
+        lease_id = f"lease-{next(self._lease_ids)}"
+        timeout_id = None
+        if timeout_s:
+            timeout_id = GLib.timeout_add_seconds(
+                timeout_s, self._on_lease_timeout, lease_id
+            )
+        self._leases[lease_id] = (owner, governor, timeout_id)
+
+        if not self._set_override(f"lease:{lease_id}", OVERRIDE_PRIORITY_LEASE,
+                                  {"governor": governor}):
+            self._drop_lease(lease_id, "could not be applied")
+            raise dbus.exceptions.DBusException(
+                f"Failed to switch to {governor}",
+                name="io.github.serverket.cpugov.Error.WriteFailed"
+            )
+        print(f"cpugov-daemon: {lease_id}: {governor} for {owner}"
+              f"{f' for {timeout_s}s' if timeout_s else ''}",
+              file=sys.stderr)
+        return dbus.String(lease_id)
+
+    def _on_lease_timeout(self, lease_id):
+        if lease_id in self._leases:
+            owner, governor, _timeout_id = self._leases[lease_id]
+            self._leases[lease_id] = (owner, governor, None)
+            self._drop_lease(lease_id, "timed out")
+        return False
+
+    def _drop_lease(self, lease_id, why):
+        """End a lease and restore what it overrode."""
+        _owner, _governor, timeout_id = self._leases.pop(lease_id)
+        if timeout_id is not None:
+            GLib.source_remove(timeout_id)
+        print(f"cpugov-daemon: {lease_id} ended: {why}", file=sys.stderr)
+        self._clear_override(f"lease:{lease_id}")
+
+    @dbus.service.method(
+        INTERFACE_NAME,
+        in_signature="s",
+        out_signature="",
+        sender_keyword="sender",
+        async_callbacks=("reply_cb", "error_cb"),
+    )
+    def ReleaseLease(self, lease_id, sender=None, reply_cb=None,
+                     error_cb=None):
+        """End a lease early.
+
+        The lease holder may always release it; anyone else needs Polkit
+        authorization.
+        """
+        lease_id = str(lease_id)
+        if lease_id not in self._leases:
+            raise dbus.exceptions.DBusException(
+                f"No lease {lease_id}",
+                name="io.github.serverket.cpugov.Error.InvalidLease"
+            )
+
+        def release():
+            # It may have ended while authorization was pending
+            if lease_id in self._leases:
+                self._drop_lease(lease_id, f"released by {sender}")
+
+        if self._leases[lease_id][0] == sender:
+            release()
+            reply_cb()
+            return
+        self._queue_privileged(sender, POLKIT_ACTION_SET, release,
+                               lambda _result: reply_cb(), error_cb)
+
+    # ── Automatic switching ───────────────────────────────────────
+
+    def _auto_settings(self):
+        """Return the "auto" config merged over the defaults."""
+        settings = dict(DEFAULT_AUTO_SETTINGS)
+        configured = self._load_config().get("auto")
+        if isinstance(configured, dict):
+            for key, default in DEFAULT_AUTO_SETTINGS.items():
+                value = configured.get(key, default)
+                if isinstance(default, (int, float)) and not isinstance(
+                        default, bool):
+                    try:
+                        value = max(float(value), 0.0)
+                    except (TypeError, ValueError):
+                        value = default
+                settings[key] = value
+        settings["interval_ms"] = max(int(settings["interval_ms"]),
+                                      MIN_SAMPLE_INTERVAL_MS)
+        return settings
+
+    def _start_auto(self):
+        """Start load-driven switching if config.json enables it."""
+        settings = self._auto_settings()
+        if not settings["enabled"]:
+            return
+
+        try:
+            if settings["profile"]:
+                self._auto_override = self._profile_override(
+                    settings["profile"]
+                )
+            else:
+                self._validate_governor(settings["governor"])
+                self._auto_override = {"governor": settings["governor"]}
+        except dbus.exceptions.DBusException as e:
+            print(f"cpugov-daemon: automatic switching disabled: {e}",
+                  file=sys.stderr)
+            return
+
+        self._auto = LoadGovernor(
+            ProcStatSampler(), self._on_auto_switch, settings
+        )
+        self._auto.start()
+        print(f"cpugov-daemon: automatic switching enabled "
+              f"(up at {settings['up_threshold']:g}%, "
+              f"down at {settings['down_threshold']:g}%)",
+              file=sys.stderr)
+
+    def _on_auto_switch(self, engaged, reason):
+        """Apply or withdraw the automatic override."""
+        print(f"cpugov-daemon: auto: {'engaging' if engaged else 'releasing'} "
+              f"{self._auto_override}: {reason}",
+              file=sys.stderr)
+        if engaged:
+            self._set_override("auto", OVERRIDE_PRIORITY_AUTO,
+                               self._auto_override)
+        else:
+            self._clear_override("auto")
+
+    @dbus.service.method(
+        INTERFACE_NAME,
+        in_signature="",
+        out_signature="a{sv}",
+        sender_keyword="sender"
+    )
+    def GetAutoState(self, sender=None):
+        """Get the state and last decision of automatic switching.
+
+        Loads are percentages, -1 before the first sample; changed_at
+        is the Unix time of the last decision.
+        """
+        settings = self._auto.settings if self._auto else self._auto_settings()
+        stat = self._auto._stat if self._auto else None
+        state = {
+            "enabled": dbus.Boolean(self._auto is not None, variant_level=1),
+            "engaged": dbus.Boolean(bool(self._auto and self._auto.engaged),
+                                    variant_level=1),
+            "load": dbus.Double(
+                stat.load if stat and stat.load is not None else -1.0,
+                variant_level=1),
+            "max_core_load": dbus.Double(
+                stat.max_busy if stat and stat.max_busy is not None else -1.0,
+                variant_level=1),
+            "reason": dbus.String(self._auto.reason if self._auto else "",
+                                  variant_level=1),
+            "changed_at": dbus.Double(
+                self._auto.changed_at if self._auto else 0.0,
+                variant_level=1),
+            "governor": dbus.String(settings["governor"], variant_level=1),
+            "profile": dbus.String(settings["profile"], variant_level=1),
+        }
+        for key in ("up_threshold", "down_threshold", "core_up_threshold",
+                    "core_down_threshold", "up_dwell_s", "down_dwell_s"):
+            state[key] = dbus.Double(settings[key], variant_level=1)
+        return dbus.Dictionary(state, signature="sv")
+
+    # ── D-Bus methods ─────────────────────────────────────────────
+
+    @dbus.service.method(
+        INTERFACE_NAME,
+        in_signature="",
+        out_signature="s",
+        sender_keyword="sender"
+    )
+    def GetGovernor(self, sender=None):
+        """Get the current governor for cpu0."""
+        cpu_dirs = self._get_cpu_dirs()
+        if not cpu_dirs:
+            return "unknown"
+        path = os.path.join(cpu_dirs[0], GOVERNOR_PATH)
+        return self._reader.read(path)
+
+    @dbus.service.method(
+        INTERFACE_NAME,
+        in_signature="",
+        out_signature="as",
+        sender_keyword="sender"
+    )
+    def GetAvailableGovernors(self, sender=None):
+        """Get list of available governors."""
+        cpu_dirs = self._get_cpu_dirs()
+        if not cpu_dirs:
+            return dbus.Array([], signature="s")
+        path = os.path.join(cpu_dirs[0], AVAIL_GOVERNORS_PATH)
+        governors = self._read_sysfs(path).split()
+        return dbus.Array(governors, signature="s")
+
+    @dbus.service.method(
+        INTERFACE_NAME,
+        in_signature="s",
+        out_signature="b",
+        sender_keyword="sender",
+        async_callbacks=("reply_cb", "error_cb"),
+    )
+    def SetGovernor(self, governor, sender=None, reply_cb=None,
+                    error_cb=None):
+        """Set the governor for all CPUs. Requires Polkit authorization.
+
+        Replies False when the governor was saved but an active override
+        (hold, lease, automatic switching, process rule) keeps another.
+        """
+        self._validate_governor(governor)
+
+        # Authorize without blocking the main loop, then apply in order
+        self._queue_privileged(
+            sender, POLKIT_ACTION_SET,
+            lambda: self._apply_governor(governor),
+            reply_cb, error_cb,
+        )
+
+    def _validate_governor(self, governor):
+        """Raise InvalidGovernor unless governor is available."""
+        available = self.GetAvailableGovernors()
+        if governor not in available:
+            raise dbus.exceptions.DBusException(
+                f"Invalid governor: {governor}. "
+                f"Available: {', '.join(available)}",
+                name="io.github.serverket.cpugov.Error.InvalidGovernor"
+            )
+
+    def _apply_governor(self, governor):
+        """Write an authorized governor to all CPUs."""
+        in_effect = self._defer_to_overrides(
+            self._policy_setting_changes("governor", "cpu_governors",
+                                         governor),
+            f"governor '{governor}'",
+        )
+        if in_effect is not None:
+            return in_effect
+
+        self._apply_policy_setting(
+            POLICY_GOVERNOR, "governor", governor, self._policies
+        )
+
+        # Emit signal
+        self.GovernorChanged(governor)
+
+        # Persist the choice
+        self._save_policy_setting(
+            "governor", "cpu_governors", "governor", governor
+        )
+
+        return True
+
+    @dbus.service.method(
+        INTERFACE_NAME,
+        in_signature="aus",
+        out_signature="b",
+        sender_keyword="sender",
+        async_callbacks=("reply_cb", "error_cb"),
+    )
+    def SetGovernorForCpus(self, cpus, governor, sender=None, reply_cb=None,
+                           error_cb=None):
+        """Set the governor for some CPUs. Requires Polkit authorization.
+
+        Every cpufreq policy touched must have all of its CPUs in cpus.
+        The per-CPU choice is persisted and reapplied on startup until the
+        next SetGovernor. Like SetGovernor, replies False while an
+        override keeps another governor.
+        """
+        self._validate_governor(governor)
+        cpus = sorted({int(cpu) for cpu in cpus})
+        self._policies_for_cpus(cpus)
+
+        self._queue_privileged(
+            sender, POLKIT_ACTION_SET,
+            lambda: self._apply_cpu_governor(cpus, governor),
+            reply_cb, error_cb,
+        )
+
+    @dbus.service.method(
+        INTERFACE_NAME,
+        in_signature="ss",
+        out_signature="b",
+        sender_keyword="sender",
+        async_callbacks=("reply_cb", "error_cb"),
+    )
+    def SetGovernorForCpuList(self, cpu_list, governor, sender=None,
+                              reply_cb=None, error_cb=None):
+        """Like SetGovernorForCpus, with a CPU list such as "0-7,16-23"."""
+        try:
+            cpus = parse_cpu_list(cpu_list)
+        except ValueError as e:
+            raise dbus.exceptions.DBusException(
+                f"Invalid CPU list '{cpu_list}': {e}",
+                name="io.github.serverket.cpugov.Error.InvalidCpus"
+            )
+        self.SetGovernorForCpus(cpus, governor, sender=sender,
+                                reply_cb=reply_cb, error_cb=error_cb)
+
+    def _apply_cpu_governor(self, cpus, governor):
+        """Write an authorized governor to the policies of some CPUs."""
+        # Topology may have changed while authorization was pending
+        policies = self._policies_for_cpus(cpus)
+        in_effect = self._defer_to_overrides(
+            self._policy_setting_changes("governor", "cpu_governors",
+                                         governor, cpus),
+            f"governor '{governor}' for CPUs {format_cpu_list(cpus)}",
+        )
+        if in_effect is not None:
+            return in_effect
+
+        self._apply_policy_setting(
+            POLICY_GOVERNOR, "governor", governor, policies
+        )
+
+        # GovernorChanged reports the governor of the first CPU
+        if self._is_first_cpu_in(cpus):
+            self.GovernorChanged(governor)
+
+        # Persist the per-CPU choice
+        self._save_policy_setting(
+            "governor", "cpu_governors", "governor", governor, cpus
+        )
+
+        return True
+
+    def _is_first_cpu_in(self, cpus):
+        """Whether cpus includes the CPU that Get* methods report on."""
+        cpu_ids = self._static_info["cpu_ids"]
+        return bool(cpu_ids) and cpu_ids[0] in cpus
+
+    # ── Energy Performance Preference ─────────────────────────────
+
+    @dbus.service.method(
+        INTERFACE_NAME,
+        in_signature="",
+        out_signature="s",
+        sender_keyword="sender"
+    )
+    def GetEnergyPreference(self, sender=None):
+        """Get the energy performance preference of the first policy.
+
+        Returns "" when the cpufreq driver has no EPP support.
+        """
+        if not self._policies:
+            return ""
+        return self._reader.read(self._policies[0].attr(POLICY_EPP))
+
+    @dbus.service.method(
+        INTERFACE_NAME,
+        in_signature="",
+        out_signature="as",
+        sender_keyword="sender"
+    )
+    def GetAvailableEnergyPreferences(self, sender=None):
+        """Get the list of available energy performance preferences."""
+        if not self._policies:
+            return dbus.Array([], signature="s")
+        path = self._policies[0].attr(POLICY_AVAIL_EPP)
+        return dbus.Array(self._read_sysfs(path).split(), signature="s")
+
+    @dbus.service.method(
+        INTERFACE_NAME,
+        in_signature="s",
+        out_signature="b",
+        sender_keyword="sender",
+        async_callbacks=("reply_cb", "error_cb"),
+    )
+    def SetEnergyPreference(self, preference, sender=None, reply_cb=None,
+                            error_cb=None):
+        """Set the energy performance preference for all CPUs.
+
+        Requires Polkit authorization. Replies False when the preference
+        was saved but an active override keeps another.
+        """
+        self._validate_energy_preference(preference)
+
+        self._queue_privileged(
+            sender, POLKIT_ACTION_SET,
+            lambda: self._apply_energy_preference(preference),
+            reply_cb, error_cb,
+        )
+
+    @dbus.service.method(
+        INTERFACE_NAME,
+        in_signature="aus",
+        out_signature="b",
+        sender_keyword="sender",
+        async_callbacks=("reply_cb", "error_cb"),
+    )
+    def SetEnergyPreferenceForCpus(self, cpus, preference, sender=None,
+                                   reply_cb=None, error_cb=None):
+        """Set the energy performance preference for some CPUs.
+
+        Every cpufreq policy touched must have all of its CPUs in cpus.
+        Requires Polkit authorization; replies False like
+        SetEnergyPreference.
+        """
+        self._validate_energy_preference(preference)
+        cpus = sorted({int(cpu) for cpu in cpus})
+        self._policies_for_cpus(cpus)
+
+        self._queue_privileged(
+            sender, POLKIT_ACTION_SET,
+            lambda: self._apply_energy_preference(preference, cpus),
+            reply_cb, error_cb,
+        )
+
+    def _validate_energy_preference(self, preference):
+        """Raise InvalidEnergyPreference unless preference is available."""
+        available = self.GetAvailableEnergyPreferences()
+        if preference not in available:
+            raise dbus.exceptions.DBusException(
+                f"Invalid energy preference: {preference}. "
+                f"Available: {', '.join(available) or 'none'}",
+                name="io.github.serverket.cpugov.Error.InvalidEnergyPreference"
+            )
+
+    def _apply_energy_preference(self, preference, cpus=None):
+        """Write an authorized energy preference to all or some CPUs.
+
+        intel_pstate refuses anything but "performance" while the
+        performance governor is active; that surfaces as WriteFailed.
+        """
+        if cpus is None:
+            policies = self._policies
+        else:
+            policies = self._policies_for_cpus(cpus)
+        where = "" if cpus is None else f" for CPUs {format_cpu_list(cpus)}"
+        in_effect = self._defer_to_overrides(
+            self._policy_setting_changes("energy_preference",
+                                         "cpu_energy_preferences",
+                                         preference, cpus),
+            f"energy preference '{preference}'{where}",
+        )
+        if in_effect is not None:
+            return in_effect
 
-    # ── Helper methods ────────────────────────────────────────────
+        self._apply_policy_setting(
+            POLICY_EPP, "energy preference", preference, policies
+        )
 
-    @staticmethod
-    def _get_cpu_dirs():
-        """Return sorted list of cpu directories that have cpufreq."""
-        pattern = os.path.join(SYSFS_CPU_BASE, "cpu[0-9]*")
-        dirs = sorted(glob.glob(pattern),
-                      key=lambda d: int(os.path.basename(d)[3:]))
-        return [d for d in dirs
-                if os.path.exists(os.path.join(d, GOVERNOR_PATH))]
+        if cpus is None or self._is_first_cpu_in(cpus):
+            self.EnergyPreferenceChanged(preference)
 
-    @staticmethod
-    def _read_sysfs(path):
-        """Read a sysfs file and return stripped content."""
-        try:
-            with open(path, "r") as f:
-                return f.read().strip()
-        except (IOError, OSError):
-            return ""
+        self._save_policy_setting(
+            "energy_preference", "cpu_energy_preferences",
+            "energy preference", preference, cpus
+        )
 
-    @staticmethod
-    def _write_sysfs(path, value):
-        """Write a value to a sysfs file."""
-        with open(path, "w") as f:
-            f.write(value)
+        return True
+
+    # ── Frequency limits ──────────────────────────────────────────
+
+    @dbus.service.method(
+        INTERFACE_NAME,
+        in_signature="",
+        out_signature="(auauau)",
+        sender_keyword="sender"
+    )
+    def GetFrequencyLimits(self, sender=None):
+        """Get the current scaling limits as (cpus, min_khz, max_khz)."""
+        cpus = []
+        min_khz = []
+        max_khz = []
+        for policy in self._policies:
+            lo = self._parse_khz(self._reader.read(policy.attr(POLICY_MIN_FREQ)))
+            hi = self._parse_khz(self._reader.read(policy.attr(POLICY_MAX_FREQ)))
+            for cpu in policy.cpus:
+                cpus.append(cpu)
+                min_khz.append(lo)
+                max_khz.append(hi)
+        return dbus.Struct((
+            dbus.Array(cpus, signature="u"),
+            dbus.Array(min_khz, signature="u"),
+            dbus.Array(max_khz, signature="u"),
+        ), signature="auauau")
+
+    @dbus.service.method(
+        INTERFACE_NAME,
+        in_signature="auuu",
+        out_signature="b",
+        sender_keyword="sender",
+        async_callbacks=("reply_cb", "error_cb"),
+    )
+    def SetFrequencyLimits(self, cpus, min_khz, max_khz, sender=None,
+                           reply_cb=None, error_cb=None):
+        """Set scaling_min_freq/scaling_max_freq for some or all CPUs.
 
-    def _check_polkit_auth(self, sender, action_id):
-        """Check Polkit authorization for the calling process."""
-        proxy = self._bus.get_object(
-            "org.freedesktop.PolicyKit1",
-            "/org/freedesktop/PolicyKit1/Authority"
+        An empty cpus list means every CPU, and 0 for either limit means
+        the hardware limit. Both must lie within cpuinfo_min_freq and
+        cpuinfo_max_freq. Requires Polkit authorization; the limits are
+        persisted and restored on startup. Replies False when an active
+        override keeps other limits.
+        """
+        cpus = sorted({int(cpu) for cpu in cpus})
+        min_khz = int(min_khz)
+        max_khz = int(max_khz)
+        policies = self._policies_for_cpus(cpus) if cpus else self._policies
+        self._resolve_frequency_limits(policies, min_khz, max_khz)
+
+        self._queue_privileged(
+            sender, POLKIT_ACTION_SET,
+            lambda: self._apply_frequency_limits(cpus, min_khz, max_khz),
+            reply_cb, error_cb,
         )
-        authority = dbus.Interface(
-            proxy,
-            "org.freedesktop.PolicyKit1.Authority"
+
+    def _resolve_frequency_limits(self, policies, min_khz, max_khz):
+        """Validate limits against each policy's hardware range.
+
+        Returns a (policy, min_khz, max_khz) list with 0 replaced by the
+        hardware limit, or raises InvalidFrequencyLimits.
+        """
+        resolved = []
+        for policy in policies:
+            hw_min = self._parse_khz(
+                self._read_sysfs(policy.attr(POLICY_CPUINFO_MIN_FREQ))
+            )
+            hw_max = self._parse_khz(
+                self._read_sysfs(policy.attr(POLICY_CPUINFO_MAX_FREQ))
+            )
+            lo = min_khz or hw_min
+            hi = max_khz or hw_max
+            if not hw_min <= lo <= hi <= hw_max:
+                raise dbus.exceptions.DBusException(
+                    f"Invalid frequency limits {lo}-{hi} kHz: CPUs "
+                    f"{format_cpu_list(policy.cpus)} support "
+                    f"{hw_min}-{hw_max} kHz",
+                    name="io.github.serverket.cpugov.Error.InvalidFrequencyLimits"
+                )
+            resolved.append((policy, lo, hi))
+        return resolved
+
+    def _write_frequency_limits(self, transaction, resolved):
+        """Write resolved limits in an order the kernel accepts.
+
+        The kernel rejects a floor above the current ceiling, so a policy
+        whose new minimum exceeds its current maximum gets the maximum
+        first; every other policy gets the minimum first. Returns a list
+        of (policy, error) for the writes that failed.
+        """
+        first = []
+        second = []
+        by_path = {}
+        for policy, lo, hi in resolved:
+            min_path = policy.attr(POLICY_MIN_FREQ)
+            max_path = policy.attr(POLICY_MAX_FREQ)
+            by_path[min_path] = by_path[max_path] = policy
+            cur_max = self._parse_khz(self._reader.read(max_path))
+            if lo > cur_max:
+                first.append((max_path, str(hi)))
+                second.append((min_path, str(lo)))
+            else:
+                first.append((min_path, str(lo)))
+                second.append((max_path, str(hi)))
+
+        failures = transaction.apply(first)
+        if not failures:
+            failures = transaction.apply(second)
+        return [(by_path[path], e) for path, e in failures]
+
+    def _apply_frequency_limits(self, cpus, min_khz, max_khz):
+        """Write authorized frequency limits to all or some CPUs."""
+        policies = self._policies_for_cpus(cpus) if cpus else self._policies
+        resolved = self._resolve_frequency_limits(policies, min_khz, max_khz)
+        where = f" for CPUs {format_cpu_list(cpus)}" if cpus else ""
+        in_effect = self._defer_to_overrides(
+            self._policy_setting_changes("frequency_limits",
+                                         "cpu_frequency_limits",
+                                         [min_khz, max_khz], cpus or None),
+            f"frequency limits{where}",
         )
+        if in_effect is not None:
+            return in_effect
 
-        subject = (
-            "system-bus-name",
-            {"name": dbus.String(sender, variant_level=1)}
+        transaction = self._begin_transaction()
+        failures = self._write_frequency_limits(transaction, resolved)
+        if failures:
+            self._rollback(transaction)
+            raise dbus.exceptions.DBusException(
+                f"Failed to set frequency limits on "
+                f"{self._format_policy_failures(failures)}; "
+                f"previous values restored",
+                name="io.github.serverket.cpugov.Error.WriteFailed"
+            )
+
+        # Persist what was asked for, so 0 keeps meaning "hardware limit"
+        self._save_policy_setting(
+            "frequency_limits", "cpu_frequency_limits", "frequency limits",
+            [min_khz, max_khz], cpus or None
         )
 
-        result = authority.CheckAuthorization(
-            subject,
-            action_id,
-            {},  # details
-            dbus.UInt32(1),  # AllowUserInteraction
-            "",  # cancellation_id
+        return True
+
+    # ── Turbo / boost ─────────────────────────────────────────────
+
+    def _boost_interface(self):
+        """Detect how this host toggles turbo/boost.
+
+        Returns (paths, inverted) or None: intel_pstate's global no_turbo
+        (inverted), the global cpufreq/boost of acpi-cpufreq, or the
+        per-policy boost attribute of amd_pstate and newer drivers.
+        """
+        no_turbo = os.path.join(SYSFS_CPU_BASE, INTEL_NO_TURBO_PATH)
+        if os.path.exists(no_turbo):
+            return [no_turbo], True
+
+        boost = os.path.join(SYSFS_CPU_BASE, CPUFREQ_BOOST_PATH)
+        if os.path.exists(boost):
+            return [boost], False
+
+        paths = [policy.attr(POLICY_BOOST) for policy in self._policies
+                 if os.path.exists(policy.attr(POLICY_BOOST))]
+        if paths:
+            return paths, False
+        return None
+
+    def _read_boost(self):
+        """Whether boost is on, or None without a boost interface."""
+        interface = self._boost_interface()
+        if interface is None:
+            return None
+        paths, inverted = interface
+        return (self._reader.read(paths[0]) == "1") != inverted
+
+    def _write_boost(self, transaction, enabled):
+        """Write the boost setting within a transaction.
+
+        Returns (path, error) for each write that failed.
+        """
+        paths, inverted = self._boost_interface()
+        value = "1" if enabled != inverted else "0"
+        return transaction.apply([(path, value) for path in paths])
+
+    @dbus.service.method(
+        INTERFACE_NAME,
+        in_signature="",
+        out_signature="b",
+        sender_keyword="sender"
+    )
+    def GetBoost(self, sender=None):
+        """Get whether turbo/boost is enabled.
+
+        Fails with NotSupported when no boost interface is available.
+        """
+        enabled = self._read_boost()
+        if enabled is None:
+            raise dbus.exceptions.DBusException(
+                "Turbo/boost control is not available on this system",
+                name="io.github.serverket.cpugov.Error.NotSupported"
+            )
+        return enabled
+
+    @dbus.service.method(
+        INTERFACE_NAME,
+        in_signature="b",
+        out_signature="b",
+        sender_keyword="sender",
+        async_callbacks=("reply_cb", "error_cb"),
+    )
+    def SetBoost(self, enabled, sender=None, reply_cb=None, error_cb=None):
+        """Enable or disable turbo/boost. Requires Polkit authorization.
+
+        Replies False when the setting was saved but an active override
+        keeps the other one.
+        """
+        # Fails early if there is nothing to control
+        self.GetBoost()
+        enabled = bool(enabled)
+
+        self._queue_privileged(
+            sender, POLKIT_ACTION_SET,
+            lambda: self._apply_boost(enabled),
+            reply_cb, error_cb,
+        )
+
+    def _apply_boost(self, enabled):
+        """Write an authorized boost setting."""
+        in_effect = self._defer_to_overrides(
+            {"boost": enabled}, f"boost {'on' if enabled else 'off'}"
         )
+        if in_effect is not None:
+            return in_effect
 
-        is_authorized = result[0]
-        if not is_authorized:
+        transaction = self._begin_transaction()
+        failures = self._write_boost(transaction, enabled)
+        if failures:
+            self._rollback(transaction)
             raise dbus.exceptions.DBusException(
-                f"Not authorized for action: {action_id}",
-                name="org.freedesktop.PolicyKit1.Error.NotAuthorized"
+                f"Failed to turn boost {'on' if enabled else 'off'}: "
+                f"{', '.join(f'{path} ({e.strerror or e})' for path, e in failures)}",
+                name="io.github.serverket.cpugov.Error.WriteFailed"
             )
 
-    def _get_cpu_model(self):
-        """Read CPU model from /proc/cpuinfo."""
-        try:
-            with open(CPU_MODEL_PATH, "r") as f:
-                for line in f:
-                    if line.startswith("model name"):
-                        return line.split(":", 1)[1].strip()
-        except (IOError, OSError):
-            pass
-        return "Unknown"
+        self.BoostChanged(enabled)
+
+        if self._update_config(boost=enabled):
+            print(f"cpugov-daemon: saved boost {'on' if enabled else 'off'} "
+                  f"to {CONFIG_PATH}",
+                  file=sys.stderr)
+        self._clear_active_profile()
+
+        return True
+
+    # ── Profiles ──────────────────────────────────────────────────
 
-    def _save_governor(self, governor):
-        """Save the governor choice to config file for persistence."""
+    def _load_profiles(self):
+        """Return the built-in profiles merged with profiles.json."""
+        profiles = {name: dict(settings)
+                    for name, settings in DEFAULT_PROFILES.items()}
         try:
-            os.makedirs(os.path.dirname(CONFIG_PATH), exist_ok=True)
-            config = {"governor": governor}
-            with open(CONFIG_PATH, "w") as f:
-                json.dump(config, f, indent=2)
-                f.write("\n")
-            print(f"cpugov-daemon: saved governor '{governor}' to {CONFIG_PATH}",
+            with open(PROFILES_PATH, "r") as f:
+                custom = json.load(f)
+        except FileNotFoundError:
+            return profiles
+        except (IOError, OSError, json.JSONDecodeError) as e:
+            print(f"cpugov-daemon: ignoring {PROFILES_PATH}: {e}",
                   file=sys.stderr)
-        except (IOError, OSError) as e:
-            print(f"cpugov-daemon: failed to save config: {e}",
+            return profiles
+
+        if not isinstance(custom, dict):
+            print(f"cpugov-daemon: ignoring {PROFILES_PATH}: "
+                  f"expected an object of profiles",
                   file=sys.stderr)
+            return profiles
+        for name, settings in custom.items():
+            if isinstance(settings, dict):
+                profiles[name] = settings
+        return profiles
 
-    def _load_saved_governor(self):
-        """Load the saved governor from /etc/cpugov.conf."""
-        try:
-            with open(CONFIG_PATH, "r") as f:
-                config = json.load(f)
-            return config.get("governor")
-        except (IOError, OSError, json.JSONDecodeError):
-            return None
+    @staticmethod
+    def _pick_available(label, wanted, available):
+        """Return the first candidate in wanted that is available."""
+        candidates = [wanted] if isinstance(wanted, str) else list(wanted)
+        for candidate in candidates:
+            if candidate in available:
+                return candidate
+        raise dbus.exceptions.DBusException(
+            f"No available {label} among {', '.join(map(str, candidates))}",
+            name="io.github.serverket.cpugov.Error.InvalidProfile"
+        )
 
-    def _restore_governor(self):
-        """Restore the saved governor on daemon startup."""
-        saved = self._load_saved_governor()
-        if not saved:
-            return
+    def _resolve_profile(self, name):
+        """Turn a profile into concrete settings for this host.
 
-        # Validate it's still available
-        cpu_dirs = self._get_cpu_dirs()
-        if not cpu_dirs:
-            return
+        Returns a dict with the governor, energy_preference,
+        frequency_limits (resolved per policy) and boost entries the
+        profile sets and the host supports, or raises InvalidProfile.
+        """
+        settings = self._load_profiles().get(name)
+        if settings is None:
+            raise dbus.exceptions.DBusException(
+                f"Unknown profile: {name}",
+                name="io.github.serverket.cpugov.Error.InvalidProfile"
+            )
 
-        path = os.path.join(cpu_dirs[0], AVAIL_GOVERNORS_PATH)
-        available = self._read_sysfs(path).split()
-        if saved not in available:
-            print(f"cpugov-daemon: saved governor '{saved}' no longer available, skipping",
-                  file=sys.stderr)
-            return
+        plan = {}
+        if settings.get("governor"):
+            plan["governor"] = self._pick_available(
+                "governor", settings["governor"],
+                self.GetAvailableGovernors(),
+            )
 
-        # Apply to all CPUs
-        for cpu_dir in cpu_dirs:
+        epps = self.GetAvailableEnergyPreferences()
+        if settings.get("energy_preference") and epps:
+            plan["energy_preference"] = self._pick_available(
+                "energy preference", settings["energy_preference"], epps
+            )
+
+        if settings.get("frequency_limits") is not None:
             try:
-                self._write_sysfs(
-                    os.path.join(cpu_dir, GOVERNOR_PATH), saved
+                min_khz, max_khz = (int(khz)
+                                    for khz in settings["frequency_limits"])
+            except (TypeError, ValueError):
+                raise dbus.exceptions.DBusException(
+                    f"Invalid frequency limits in profile {name}: "
+                    f"{settings['frequency_limits']}",
+                    name="io.github.serverket.cpugov.Error.InvalidProfile"
                 )
-            except (IOError, OSError) as e:
-                print(f"cpugov-daemon: failed to restore governor on {cpu_dir}: {e}",
-                      file=sys.stderr)
+            plan["frequency_limits"] = (
+                [min_khz, max_khz],
+                self._resolve_frequency_limits(
+                    self._policies, min_khz, max_khz
+                ),
+            )
 
-        print(f"cpugov-daemon: restored governor '{saved}' from {CONFIG_PATH}",
-              file=sys.stderr)
+        if (settings.get("boost") is not None
+                and self._boost_interface() is not None):
+            plan["boost"] = bool(settings["boost"])
 
-    # ── D-Bus methods ─────────────────────────────────────────────
+        return plan
+
+    def _clear_active_profile(self):
+        """Forget the active profile after a setting changed on its own."""
+        if not self._load_config().get("profile"):
+            return
+        self._update_config(profile="")
+        self.ProfileChanged("")
 
     @dbus.service.method(
         INTERFACE_NAME,
         in_signature="",
-        out_signature="s",
+        out_signature="as",
         sender_keyword="sender"
     )
-    def GetGovernor(self, sender=None):
-        """Get the current governor for cpu0."""
-        cpu_dirs = self._get_cpu_dirs()
-        if not cpu_dirs:
-            return "unknown"
-        path = os.path.join(cpu_dirs[0], GOVERNOR_PATH)
-        return self._read_sysfs(path)
+    def GetProfiles(self, sender=None):
+        """Get the names of the built-in and configured profiles."""
+        return dbus.Array(sorted(self._load_profiles()), signature="s")
 
     @dbus.service.method(
         INTERFACE_NAME,
         in_signature="",
-        out_signature="as",
+        out_signature="s",
         sender_keyword="sender"
     )
-    def GetAvailableGovernors(self, sender=None):
-        """Get list of available governors."""
-        cpu_dirs = self._get_cpu_dirs()
-        if not cpu_dirs:
-            return dbus.Array([], signature="s")
-        path = os.path.join(cpu_dirs[0], AVAIL_GOVERNORS_PATH)
-        governors = self._read_sysfs(path).split()
-        return dbus.Array(governors, signature="s")
+    def GetActiveProfile(self, sender=None):
+        """Get the last applied profile.
+
+        Returns "" once any setting has been changed on its own.
+        """
+        return self._load_config().get("profile") or ""
 
     @dbus.service.method(
         INTERFACE_NAME,
         in_signature="s",
         out_signature="b",
-        sender_keyword="sender"
+        sender_keyword="sender",
+        async_callbacks=("reply_cb", "error_cb"),
     )
-    def SetGovernor(self, governor, sender=None):
-        """Set the governor for all CPUs. Requires Polkit authorization."""
-        # Validate governor name
-        available = self.GetAvailableGovernors(sender=sender)
-        if governor not in available:
-            raise dbus.exceptions.DBusException(
-                f"Invalid governor: {governor}. "
-                f"Available: {', '.join(available)}",
-                name="io.github.serverket.cpugov.Error.InvalidGovernor"
-            )
+    def ApplyProfile(self, name, sender=None, reply_cb=None, error_cb=None):
+        """Apply a named profile. Requires Polkit authorization.
 
-        # Check Polkit authorization
-        self._check_polkit_auth(sender, POLKIT_ACTION_SET)
+        Governor, energy preference, frequency limits and boost are
+        changed under one authorization and one transaction: if any
+        write fails, everything is put back. Replies False when the
+        profile was saved but an active override keeps some of its
+        settings from taking effect.
+        """
+        self._resolve_profile(name)
 
-        # Apply to all CPUs
-        cpu_dirs = self._get_cpu_dirs()
-        for cpu_dir in cpu_dirs:
-            path = os.path.join(cpu_dir, GOVERNOR_PATH)
-            self._write_sysfs(path, governor)
+        self._queue_privileged(
+            sender, POLKIT_ACTION_SET,
+            lambda: self._apply_profile(name),
+            reply_cb, error_cb,
+        )
 
-        # Emit signal
-        self.GovernorChanged(governor)
+    def _apply_profile(self, name):
+        """Write an authorized profile in one all-or-nothing pass."""
+        plan = self._resolve_profile(name)
 
-        # Persist the choice
-        self._save_governor(governor)
+        # Persist as individual settings so startup restores them
+        changes = {"profile": name}
+        if "governor" in plan:
+            changes.update(governor=plan["governor"], cpu_governors={})
+        if "energy_preference" in plan:
+            changes.update(energy_preference=plan["energy_preference"],
+                           cpu_energy_preferences={})
+        if "frequency_limits" in plan:
+            changes.update(frequency_limits=plan["frequency_limits"][0],
+                           cpu_frequency_limits={})
+        if "boost" in plan:
+            changes.update(boost=plan["boost"])
+        in_effect = self._defer_to_overrides(changes, f"profile '{name}'")
+        if in_effect is not None:
+            return in_effect
+
+        transaction = self._begin_transaction()
+
+        # Governor first: intel_pstate only takes some energy
+        # preferences once the performance governor is gone
+        failures = []
+        if "governor" in plan:
+            failures = self._write_policies(
+                transaction, self._policies, POLICY_GOVERNOR,
+                plan["governor"],
+            )
+        if not failures and "energy_preference" in plan:
+            failures = self._write_policies(
+                transaction, self._policies, POLICY_EPP,
+                plan["energy_preference"],
+            )
+        if not failures and "frequency_limits" in plan:
+            failures = self._write_frequency_limits(
+                transaction, plan["frequency_limits"][1]
+            )
+        if failures:
+            failures = self._format_policy_failures(failures)
+        elif "boost" in plan:
+            failures = ", ".join(
+                f"{path} ({e.strerror or e})"
+                for path, e in self._write_boost(transaction, plan["boost"])
+            )
+
+        if failures:
+            self._rollback(transaction)
+            raise dbus.exceptions.DBusException(
+                f"Failed to apply profile '{name}' on {failures}; "
+                f"previous values restored",
+                name="io.github.serverket.cpugov.Error.WriteFailed"
+            )
+
+        if "governor" in plan:
+            self.GovernorChanged(plan["governor"])
+        if "energy_preference" in plan:
+            self.EnergyPreferenceChanged(plan["energy_preference"])
+        if "boost" in plan:
+            self.BoostChanged(plan["boost"])
+        self.ProfileChanged(name)
+
+        if self._update_config(**changes):
+            print(f"cpugov-daemon: applied profile '{name}', saved "
+                  f"to {CONFIG_PATH}",
+                  file=sys.stderr)
 
         return True
 
+    # ── CPU information ───────────────────────────────────────────
+
     @dbus.service.method(
         INTERFACE_NAME,
         in_signature="",
@@ -243,51 +3408,249 @@ class CPUGovDaemon(dbus.service.Object):
     )
     def GetCpuInfo(self, sender=None):
         """Get comprehensive CPU information."""
-        cpu_dirs = self._get_cpu_dirs()
-        core_count = len(cpu_dirs)
+        static = self._static_info
 
-        # CPU model
-        model = self._get_cpu_model()
+        # Utilization comes from the sampler's last pass; without
+        # subscribers it covers the time since the previous call.
+        self._refresh_sampler()
+        cur_khz = self._sampler.cur_khz
+        governors = self._sampler.governors
+        busy = self._sampler.busy
+        cpu_ids = static["cpu_ids"]
 
-        # Per-core info
+        # Only the governor, current frequency and load change between
+        # calls, and the sampler already has them; everything else was
+        # prepared when the topology was scanned.
         per_core = []
-        for cpu_dir in cpu_dirs:
-            core_name = os.path.basename(cpu_dir)
-            core_gov = self._read_sysfs(
-                os.path.join(cpu_dir, GOVERNOR_PATH)
-            )
-            cur_freq = self._read_sysfs(
-                os.path.join(cpu_dir, CUR_FREQ_PATH)
+        for i, (_governor_path, _cur_freq_path, static_fields) in enumerate(
+                static["cores"]):
+            core = dict(static_fields)
+            core["governor"] = dbus.String(governors[i] or "",
+                                           variant_level=1)
+            core["cur_freq_khz"] = dbus.String(str(cur_khz[i] or 0),
+                                               variant_level=1)
+            core["busy_percent"] = dbus.Int32(
+                -1 if busy[i] == FrequencySampler.BUSY_UNKNOWN else busy[i],
+                variant_level=1
             )
-            min_freq = self._read_sysfs(
-                os.path.join(cpu_dir, MIN_FREQ_PATH)
-            )
-            max_freq = self._read_sysfs(
-                os.path.join(cpu_dir, MAX_FREQ_PATH)
-            )
-
-            per_core.append(dbus.Dictionary({
-                "name": dbus.String(core_name, variant_level=1),
-                "governor": dbus.String(core_gov, variant_level=1),
-                "cur_freq_khz": dbus.String(cur_freq, variant_level=1),
-                "min_freq_khz": dbus.String(min_freq, variant_level=1),
-                "max_freq_khz": dbus.String(max_freq, variant_level=1),
-            }, signature="sv"))
-
-        # Thread count (includes HT)
-        online_path = os.path.join(SYSFS_CPU_BASE, "online")
-        online_str = self._read_sysfs(online_path)
+            temperature = self._thermal.cpu_temperature(cpu_ids[i])
+            if temperature is not None:
+                core["temperature_c"] = dbus.Double(temperature / 1000,
+                                                    variant_level=1)
+            per_core.append(dbus.Dictionary(core, signature="sv"))
 
         info = dbus.Dictionary({
-            "model": dbus.String(model, variant_level=1),
-            "core_count": dbus.Int32(core_count, variant_level=1),
-            "online": dbus.String(online_str, variant_level=1),
+            "model": static["model"],
+            "core_count": static["core_count"],
+            "online": static["online"],
             "per_core": dbus.Array(per_core, signature="a{sv}",
                                    variant_level=1),
         }, signature="sv")
 
         return info
 
+    @dbus.service.method(
+        INTERFACE_NAME,
+        in_signature="",
+        out_signature="(susauauauauayas)",
+        sender_keyword="sender"
+    )
+    def GetCpuInfoV2(self, sender=None):
+        """Get CPU information as typed per-core columns.
+
+        Returns (model, core_count, online, cpu_ids, cur_khz, min_khz,
+        max_khz, governor_index, governor_table): the arrays are indexed
+        by core, and governor_index[i] is a position in governor_table.
+        """
+        static = self._static_info
+        self._refresh_sampler()
+        _full, _cpu_ids, cur_khz, governor_index, governor_table, _busy = \
+            self._sampler.columns()
+
+        return dbus.Struct((
+            *static["v2_header"],
+            static["cpu_ids"],
+            dbus.Array(cur_khz, signature="u"),
+            static["min_khz"],
+            static["max_khz"],
+            dbus.ByteArray(bytes(governor_index)),
+            dbus.Array(governor_table, signature="s"),
+        ), signature="susauauauauayas")
+
+    @dbus.service.method(
+        INTERFACE_NAME,
+        in_signature="t",
+        out_signature="(tbauauayasay)",
+        sender_keyword="sender"
+    )
+    def GetCpuInfoSince(self, generation, sender=None):
+        """Get the cores whose frequency, governor or load changed since
+        generation.
+
+        Returns (generation, full, cpu_ids, cur_khz, governor_index,
+        governor_table, busy); busy is in percent, 255 when unknown.
+        Pass the returned generation on the next call; full is set when
+        every core is included and rows for CPUs not listed should be
+        dropped (first call, hotplug, daemon restart).
+        """
+        self._refresh_sampler()
+        return dbus.Struct((
+            dbus.UInt64(self._sampler.generation),
+            *self._frequency_columns(int(generation)),
+        ), signature="tbauauayasay")
+
+    @dbus.service.method(
+        INTERFACE_NAME,
+        in_signature="u",
+        out_signature="u",
+        sender_keyword="sender"
+    )
+    def Subscribe(self, interval_ms, sender=None):
+        """Request FrequenciesUpdated signals every interval_ms.
+
+        An interval of 0 selects the daemon default. The sampler runs at
+        the fastest rate requested by any subscriber; the effective
+        interval is returned.
+        """
+        if not interval_ms:
+            interval_ms = self._default_interval_ms
+        self._subscribers[sender] = max(int(interval_ms),
+                                        MIN_SAMPLE_INTERVAL_MS)
+        self._update_sampler()
+        return dbus.UInt32(min(self._subscribers.values()))
+
+    @dbus.service.method(
+        INTERFACE_NAME,
+        in_signature="",
+        out_signature="",
+        sender_keyword="sender"
+    )
+    def Unsubscribe(self, sender=None):
+        """Stop receiving FrequenciesUpdated on behalf of the caller."""
+        if self._subscribers.pop(sender, None) is not None:
+            self._update_sampler()
+
+    @dbus.service.method(
+        INTERFACE_NAME,
+        in_signature="",
+        out_signature="a(ssdiau)",
+        sender_keyword="sender"
+    )
+    def GetThermals(self, sender=None):
+        """Get CPU temperature sensors and their last readings.
+
+        Returns (name, source, celsius, package, cpus) per sensor; package
+        is -1 and cpus empty where the sensor could not be mapped.
+        Readings come from the sampler's last pass while it runs.
+        """
+        if not self._sampler.running:
+            self._thermal.read()
+        return dbus.Array([
+            dbus.Struct((
+                name, source, dbus.Double(temp / 1000), dbus.Int32(package),
+                dbus.Array(cpus, signature="u"),
+            ), signature="ssdiau")
+            for (name, source, _path, package, cpus), temp
+            in zip(self._thermal.sensors, self._thermal.temps)
+        ], signature="(ssdiau)")
+
+    # ── Frequency residency ───────────────────────────────────────
+
+    def _take_residency_snapshot(self):
+        """Record time_in_state and total_trans of every policy.
+
+        Returns (monotonic_ns, {policy path: ({khz: 10ms units}, trans)}).
+        Policies without cpufreq stats are left out.
+        """
+        now_ns = time.monotonic_ns()
+        snapshot = {}
+        for policy in self._policies:
+            table = {}
+            for line in self._read_sysfs(
+                    policy.attr(POLICY_TIME_IN_STATE)).splitlines():
+                fields = line.split()
+                if len(fields) == 2 and all(f.isdigit() for f in fields):
+                    table[int(fields[0])] = int(fields[1])
+            if not table:
+                continue
+            trans = self._read_sysfs(policy.attr(POLICY_TOTAL_TRANS))
+            snapshot[policy.path] = (table, int(trans) if trans.isdigit() else 0)
+        return now_ns, snapshot
+
+    @dbus.service.method(
+        INTERFACE_NAME,
+        in_signature="aut",
+        out_signature="(tta(auauatu))",
+        sender_keyword="sender"
+    )
+    def GetFrequencyResidency(self, cpus, since_ns, sender=None):
+        """Get time spent at each frequency from cpufreq stats.
+
+        Returns (now_ns, since_ns, policies) where each policy entry is
+        (cpus, freq_khz, time_ms, transitions) counted between since_ns
+        and now_ns (CLOCK_MONOTONIC). Pass a now_ns from one of the
+        caller's own earlier calls as since_ns to measure from then; 0,
+        or a timestamp the daemon no longer holds for the caller,
+        measures from daemon start or the last hotplug, and the since_ns
+        returned says which. An empty cpus selects every policy.
+        """
+        wanted = {int(cpu) for cpu in cpus}
+        unknown = wanted - set(self._static_info["cpu_ids"])
+        if unknown:
+            raise dbus.exceptions.DBusException(
+                f"No cpufreq policy for CPUs {format_cpu_list(unknown)}",
+                name="io.github.serverket.cpugov.Error.InvalidCpus"
+            )
+        policies = [policy for policy in self._policies
+                    if not wanted or wanted.intersection(policy.cpus)]
+
+        # Each client's calls only ever evict its own baselines, least
+        # recently used first, so one it keeps measuring from stays
+        snapshots = self._residency_snapshots.get(sender, {})
+        since_ns = int(since_ns)
+        if since_ns in snapshots:
+            baseline = snapshots[since_ns]
+            snapshots.move_to_end(since_ns)
+        else:
+            since_ns, baseline = self._residency_start
+        now_ns, current = self._take_residency_snapshot()
+        if not any(policy.path in current for policy in policies):
+            raise dbus.exceptions.DBusException(
+                "cpufreq statistics (stats/time_in_state) are not available",
+                name="io.github.serverket.cpugov.Error.NotSupported"
+            )
+        snapshots = self._residency_snapshots.setdefault(
+            sender, collections.OrderedDict()
+        )
+        snapshots[now_ns] = current
+        while len(snapshots) > MAX_RESIDENCY_SNAPSHOTS:
+            snapshots.popitem(last=False)
+
+        entries = []
+        for policy in policies:
+            if policy.path not in current:
+                continue
+            table, trans = current[policy.path]
+            old_table, old_trans = baseline.get(policy.path, ({}, 0))
+            freqs = sorted(table)
+            # Counters restart when a policy is re-created
+            reset = any(table[khz] < old_table.get(khz, 0) for khz in freqs)
+            if reset:
+                old_table, old_trans = {}, 0
+            entries.append(dbus.Struct((
+                dbus.Array(policy.cpus, signature="u"),
+                dbus.Array(freqs, signature="u"),
+                dbus.Array([(table[khz] - old_table.get(khz, 0)) * 10
+                            for khz in freqs], signature="t"),
+                dbus.UInt32(max(trans - old_trans, 0)),
+            ), signature="auauatu"))
+
+        return dbus.Struct((
+            dbus.UInt64(now_ns),
+            dbus.UInt64(since_ns),
+            dbus.Array(entries, signature="(auauatu)"),
+        ), signature="tta(auauatu)")
+
     # ── D-Bus signals ─────────────────────────────────────────────
 
     @dbus.service.signal(INTERFACE_NAME, signature="s")
@@ -295,6 +3658,33 @@ class CPUGovDaemon(dbus.service.Object):
         """Emitted when the governor changes."""
         pass
 
+    @dbus.service.signal(INTERFACE_NAME, signature="s")
+    def EnergyPreferenceChanged(self, preference):
+        """Emitted when the energy performance preference changes."""
+        pass
+
+    @dbus.service.signal(INTERFACE_NAME, signature="b")
+    def BoostChanged(self, enabled):
+        """Emitted when turbo/boost is turned on or off."""
+        pass
+
+    @dbus.service.signal(INTERFACE_NAME, signature="s")
+    def ProfileChanged(self, name):
+        """Emitted when a profile is applied, or "" when one is left."""
+        pass
+
+    @dbus.service.signal(INTERFACE_NAME, signature="ttbauauayasay")
+    def FrequenciesUpdated(self, since, generation, full, cpu_ids, cur_khz,
+                           governor_index, governor_table, busy):
+        """Emitted by the shared sampler with the cores that changed.
+
+        Carries the cores that changed between generation since and
+        generation, or every core if full is set. busy is the percentage
+        of time each core was busy since the previous sample, 255 when
+        unknown.
+        """
+        pass
+
 
 def main():
     """Entry point for the daemon."""
@@ -20,6 +20,10 @@ class CPUGovDBusClient:
         self._proxy = None
         self._connection = None
         self._signal_subscription = None
+        # Cleared when the daemon predates GetCpuInfoV2
+        self._has_cpu_info_v2 = True
+        # Last FrequenciesUpdated/GetCpuInfoSince generation applied
+        self._frequency_generation = 0
 
     def connect(self, on_ready_cb=None, on_error_cb=None):
         """Connect to the D-Bus daemon asynchronously."""
@@ -144,9 +148,410 @@ class CPUGovDBusClient:
         except GLib.Error as e:
             callback(False, str(e))
 
+    def set_governor_for_cpus(self, cpus, governor, callback):
+        """Set the governor for some CPUs. Triggers Polkit auth.
+
+        Args:
+            cpus: list of CPU numbers; must cover whole cpufreq policies
+            governor: string name of the governor
+            callback: function(success_bool, error_str_or_none)
+        """
+        if not self.is_connected:
+            callback(False, "Not connected to daemon")
+            return
+
+        self._proxy.call(
+            "SetGovernorForCpus",
+            GLib.Variant("(aus)", (list(cpus), governor)),
+            Gio.DBusCallFlags.NONE,
+            30000,  # 30s timeout for Polkit dialog
+            None,
+            self._on_set_governor_done,
+            callback,
+        )
+
+    def set_governor_for_cpu_list(self, cpu_list, governor, callback):
+        """Set the governor for a CPU list such as "0-7,16-23".
+
+        Args:
+            cpu_list: kernel-style CPU list string
+            governor: string name of the governor
+            callback: function(success_bool, error_str_or_none)
+        """
+        if not self.is_connected:
+            callback(False, "Not connected to daemon")
+            return
+
+        self._proxy.call(
+            "SetGovernorForCpuList",
+            GLib.Variant("(ss)", (cpu_list, governor)),
+            Gio.DBusCallFlags.NONE,
+            30000,  # 30s timeout for Polkit dialog
+            None,
+            self._on_set_governor_done,
+            callback,
+        )
+
+    def get_energy_preference(self, callback):
+        """Get the current energy performance preference.
+
+        Args:
+            callback: function(preference_str, error_str_or_none); the
+                preference is "" when the driver has no EPP support
+        """
+        if not self.is_connected:
+            callback(None, "Not connected to daemon")
+            return
+
+        self._proxy.call(
+            "GetEnergyPreference",
+            None,
+            Gio.DBusCallFlags.NONE,
+            5000,
+            None,
+            self._on_get_governor_done,
+            callback,
+        )
+
+    def get_available_energy_preferences(self, callback):
+        """Get list of available energy performance preferences.
+
+        Args:
+            callback: function(list_of_strings, error_str_or_none)
+        """
+        if not self.is_connected:
+            callback(None, "Not connected to daemon")
+            return
+
+        self._proxy.call(
+            "GetAvailableEnergyPreferences",
+            None,
+            Gio.DBusCallFlags.NONE,
+            5000,
+            None,
+            self._on_get_available_done,
+            callback,
+        )
+
+    def set_energy_preference(self, preference, callback):
+        """Set the energy performance preference. Triggers Polkit auth.
+
+        Args:
+            preference: one of the available preferences
+            callback: function(success_bool, error_str_or_none)
+        """
+        if not self.is_connected:
+            callback(False, "Not connected to daemon")
+            return
+
+        self._proxy.call(
+            "SetEnergyPreference",
+            GLib.Variant("(s)", (preference,)),
+            Gio.DBusCallFlags.NONE,
+            30000,  # 30s timeout for Polkit dialog
+            None,
+            self._on_set_governor_done,
+            callback,
+        )
+
+    def set_energy_preference_for_cpus(self, cpus, preference, callback):
+        """Set the energy performance preference for some CPUs.
+
+        Args:
+            cpus: list of CPU numbers; must cover whole cpufreq policies
+            preference: one of the available preferences
+            callback: function(success_bool, error_str_or_none)
+        """
+        if not self.is_connected:
+            callback(False, "Not connected to daemon")
+            return
+
+        self._proxy.call(
+            "SetEnergyPreferenceForCpus",
+            GLib.Variant("(aus)", (list(cpus), preference)),
+            Gio.DBusCallFlags.NONE,
+            30000,  # 30s timeout for Polkit dialog
+            None,
+            self._on_set_governor_done,
+            callback,
+        )
+
+    def get_frequency_limits(self, callback):
+        """Get the current scaling frequency limits.
+
+        Args:
+            callback: function(limits_dict, error_str_or_none) where
+                limits_dict maps CPU number to (min_khz, max_khz)
+        """
+        if not self.is_connected:
+            callback(None, "Not connected to daemon")
+            return
+
+        self._proxy.call(
+            "GetFrequencyLimits",
+            None,
+            Gio.DBusCallFlags.NONE,
+            5000,
+            None,
+            self._on_get_frequency_limits_done,
+            callback,
+        )
+
+    def _on_get_frequency_limits_done(self, proxy, result, callback):
+        try:
+            variant = proxy.call_finish(result)
+            cpus, min_khz, max_khz = variant.unpack()[0]
+            callback(dict(zip(cpus, zip(min_khz, max_khz))), None)
+        except GLib.Error as e:
+            callback(None, str(e))
+
+    def set_frequency_limits(self, cpus, min_khz, max_khz, callback):
+        """Set scaling frequency limits. Triggers Polkit auth.
+
+        Args:
+            cpus: list of CPU numbers, empty for all CPUs
+            min_khz: frequency floor, 0 for the hardware minimum
+            max_khz: frequency ceiling, 0 for the hardware maximum
+            callback: function(success_bool, error_str_or_none)
+        """
+        if not self.is_connected:
+            callback(False, "Not connected to daemon")
+            return
+
+        self._proxy.call(
+            "SetFrequencyLimits",
+            GLib.Variant("(auuu)", (list(cpus), min_khz, max_khz)),
+            Gio.DBusCallFlags.NONE,
+            30000,  # 30s timeout for Polkit dialog
+            None,
+            self._on_set_governor_done,
+            callback,
+        )
+
+    def get_boost(self, callback):
+        """Get whether turbo/boost is enabled.
+
+        Args:
+            callback: function(enabled_bool, error_str_or_none); fails
+                when the system has no boost interface
+        """
+        if not self.is_connected:
+            callback(None, "Not connected to daemon")
+            return
+
+        self._proxy.call(
+            "GetBoost",
+            None,
+            Gio.DBusCallFlags.NONE,
+            5000,
+            None,
+            self._on_get_governor_done,
+            callback,
+        )
+
+    def set_boost(self, enabled, callback):
+        """Enable or disable turbo/boost. Triggers Polkit auth.
+
+        Args:
+            enabled: True to allow boost frequencies
+            callback: function(success_bool, error_str_or_none)
+        """
+        if not self.is_connected:
+            callback(False, "Not connected to daemon")
+            return
+
+        self._proxy.call(
+            "SetBoost",
+            GLib.Variant("(b)", (enabled,)),
+            Gio.DBusCallFlags.NONE,
+            30000,  # 30s timeout for Polkit dialog
+            None,
+            self._on_set_governor_done,
+            callback,
+        )
+
+    def get_profiles(self, callback):
+        """Get the names of the available profiles.
+
+        Args:
+            callback: function(list_of_strings, error_str_or_none)
+        """
+        if not self.is_connected:
+            callback(None, "Not connected to daemon")
+            return
+
+        self._proxy.call(
+            "GetProfiles",
+            None,
+            Gio.DBusCallFlags.NONE,
+            5000,
+            None,
+            self._on_get_available_done,
+            callback,
+        )
+
+    def get_active_profile(self, callback):
+        """Get the last applied profile.
+
+        Args:
+            callback: function(name_str, error_str_or_none); the name is
+                "" when settings were changed since
+        """
+        if not self.is_connected:
+            callback(None, "Not connected to daemon")
+            return
+
+        self._proxy.call(
+            "GetActiveProfile",
+            None,
+            Gio.DBusCallFlags.NONE,
+            5000,
+            None,
+            self._on_get_governor_done,
+            callback,
+        )
+
+    def apply_profile(self, name, callback):
+        """Apply a named profile. Triggers Polkit auth.
+
+        Args:
+            name: one of the names from get_profiles
+            callback: function(success_bool, error_str_or_none)
+        """
+        if not self.is_connected:
+            callback(False, "Not connected to daemon")
+            return
+
+        self._proxy.call(
+            "ApplyProfile",
+            GLib.Variant("(s)", (name,)),
+            Gio.DBusCallFlags.NONE,
+            30000,  # 30s timeout for Polkit dialog
+            None,
+            self._on_set_governor_done,
+            callback,
+        )
+
+    def hold_performance(self, pid, cpu_lists, reason, callback):
+        """Keep CPUs at performance while a process lives. Triggers Polkit auth.
+
+        Args:
+            pid: process to watch
+            cpu_lists: CPU lists such as "0-3", empty for all CPUs
+            reason: shown in the daemon log
+            callback: function(cookie_int, error_str_or_none)
+        """
+        if not self.is_connected:
+            callback(None, "Not connected to daemon")
+            return
+
+        self._proxy.call(
+            "HoldPerformance",
+            GLib.Variant("(uass)", (pid, list(cpu_lists), reason)),
+            Gio.DBusCallFlags.NONE,
+            30000,  # 30s timeout for Polkit dialog
+            None,
+            self._on_get_governor_done,
+            callback,
+        )
+
+    def release(self, cookie, callback):
+        """Release a hold made with hold_performance.
+
+        Args:
+            cookie: value returned by hold_performance
+            callback: function(success_bool, error_str_or_none)
+        """
+        if not self.is_connected:
+            callback(False, "Not connected to daemon")
+            return
+
+        self._proxy.call(
+            "Release",
+            GLib.Variant("(u)", (cookie,)),
+            Gio.DBusCallFlags.NONE,
+            30000,  # 30s timeout for Polkit dialog
+            None,
+            self._on_release_done,
+            callback,
+        )
+
+    def _on_release_done(self, proxy, result, callback):
+        try:
+            proxy.call_finish(result)
+            callback(True, None)
+        except GLib.Error as e:
+            callback(False, str(e))
+
+    def acquire_lease(self, governor, timeout_s, callback):
+        """Hold a governor while this connection lasts. Triggers Polkit auth.
+
+        Args:
+            governor: one of the available governors
+            timeout_s: seconds until the lease ends, 0 for no limit
+            callback: function(lease_id_str, error_str_or_none)
+        """
+        if not self.is_connected:
+            callback(None, "Not connected to daemon")
+            return
+
+        self._proxy.call(
+            "AcquireLease",
+            GLib.Variant("(su)", (governor, timeout_s)),
+            Gio.DBusCallFlags.NONE,
+            30000,  # 30s timeout for Polkit dialog
+            None,
+            self._on_get_governor_done,
+            callback,
+        )
+
+    def release_lease(self, lease_id, callback):
+        """End a lease made with acquire_lease.
+
+        Args:
+            lease_id: value returned by acquire_lease
+            callback: function(success_bool, error_str_or_none)
+        """
+        if not self.is_connected:
+            callback(False, "Not connected to daemon")
+            return
+
+        self._proxy.call(
+            "ReleaseLease",
+            GLib.Variant("(s)", (lease_id,)),
+            Gio.DBusCallFlags.NONE,
+            30000,  # 30s timeout for Polkit dialog
+            None,
+            self._on_release_done,
+            callback,
+        )
+
+    def get_auto_state(self, callback):
+        """Get the state of load-driven automatic switching.
+
+        Args:
+            callback: function(state_dict, error_str_or_none)
+        """
+        if not self.is_connected:
+            callback(None, "Not connected to daemon")
+            return
+
+        self._proxy.call(
+            "GetAutoState",
+            None,
+            Gio.DBusCallFlags.NONE,
+            5000,
+            None,
+            self._on_get_cpu_info_done,
+            callback,
+        )
+
     def get_cpu_info(self, callback):
         """Get comprehensive CPU info.
 
+        Uses the typed GetCpuInfoV2 call and falls back to GetCpuInfo on
+        daemons that do not provide it; both yield the same dict layout.
+
         Args:
             callback: function(info_dict, error_str_or_none)
         """
@@ -154,13 +559,18 @@ class CPUGovDBusClient:
             callback(None, "Not connected to daemon")
             return
 
+        if self._has_cpu_info_v2:
+            method, done_cb = "GetCpuInfoV2", self._on_get_cpu_info_v2_done
+        else:
+            method, done_cb = "GetCpuInfo", self._on_get_cpu_info_done
+
         self._proxy.call(
-            "GetCpuInfo",
+            method,
             None,
             Gio.DBusCallFlags.NONE,
             5000,
             None,
-            self._on_get_cpu_info_done,
+            done_cb,
             callback,
         )
 
@@ -172,6 +582,168 @@ class CPUGovDBusClient:
         except GLib.Error as e:
             callback(None, str(e))
 
+    def _on_get_cpu_info_v2_done(self, proxy, result, callback):
+        try:
+            variant = proxy.call_finish(result)
+        except GLib.Error as e:
+            if (Gio.DBusError.get_remote_error(e)
+                    == "org.freedesktop.DBus.Error.UnknownMethod"):
+                self._has_cpu_info_v2 = False
+                self.get_cpu_info(callback)
+                return
+            callback(None, str(e))
+            return
+
+        (model, core_count, online, cpu_ids, cur_khz, min_khz, max_khz,
+         governor_index, governor_table) = variant.unpack()[0]
+
+        per_core = [
+            {
+                "name": f"cpu{cpu_id}",
+                "governor": governor_table[gov],
+                "cur_freq_khz": cur,
+                "min_freq_khz": lo,
+                "max_freq_khz": hi,
+            }
+            for cpu_id, cur, lo, hi, gov in zip(
+                cpu_ids, cur_khz, min_khz, max_khz, governor_index
+            )
+        ]
+        callback({
+            "model": model,
+            "core_count": core_count,
+            "online": online,
+            "per_core": per_core,
+        }, None)
+
+    def get_thermals(self, callback):
+        """Get CPU temperature sensors and their last readings.
+
+        Args:
+            callback: function(sensor_list, error_str_or_none) with one
+                (name, source, celsius, package, cpus) tuple per sensor
+        """
+        if not self.is_connected:
+            callback(None, "Not connected to daemon")
+            return
+
+        self._proxy.call(
+            "GetThermals",
+            None,
+            Gio.DBusCallFlags.NONE,
+            5000,
+            None,
+            self._on_get_available_done,
+            callback,
+        )
+
+    def get_frequency_residency(self, cpus, since_ns, callback):
+        """Get time spent at each frequency since a daemon-held baseline.
+
+        Args:
+            cpus: list of CPU numbers, empty for all CPUs
+            since_ns: now_ns of an earlier result, or 0 for daemon start
+            callback: function(result_dict, error_str_or_none) where
+                result_dict holds "now_ns", "since_ns" and "policies", a
+                list of dicts with "cpus", "residency" as (freq_khz,
+                time_ms) pairs and "transitions"
+        """
+        if not self.is_connected:
+            callback(None, "Not connected to daemon")
+            return
+
+        self._proxy.call(
+            "GetFrequencyResidency",
+            GLib.Variant("(aut)", (list(cpus), since_ns)),
+            Gio.DBusCallFlags.NONE,
+            5000,
+            None,
+            self._on_get_frequency_residency_done,
+            callback,
+        )
+
+    def _on_get_frequency_residency_done(self, proxy, result, callback):
+        try:
+            variant = proxy.call_finish(result)
+        except GLib.Error as e:
+            callback(None, str(e))
+            return
+        now_ns, since_ns, policies = variant.unpack()[0]
+        callback({
+            "now_ns": now_ns,
+            "since_ns": since_ns,
+            "policies": [
+                {
+                    "cpus": list(cpus),
+                    "residency": list(zip(freqs, times)),
+                    "transitions": transitions,
+                }
+                for cpus, freqs, times, transitions in policies
+            ],
+        }, None)
+
+    def subscribe(self, interval_ms, callback):
+        """Ask the daemon sampler for FrequenciesUpdated signals.
+
+        Args:
+            interval_ms: requested sampling interval, 0 for the default
+            callback: function(effective_interval_ms, error_str_or_none)
+        """
+        if not self.is_connected:
+            callback(None, "Not connected to daemon")
+            return
+
+        self._proxy.call(
+            "Subscribe",
+            GLib.Variant("(u)", (interval_ms,)),
+            Gio.DBusCallFlags.NONE,
+            5000,
+            None,
+            self._on_subscribe_done,
+            callback,
+        )
+
+    def _on_subscribe_done(self, proxy, result, callback):
+        try:
+            variant = proxy.call_finish(result)
+            callback(variant.unpack()[0], None)
+        except GLib.Error as e:
+            callback(None, str(e))
+
+    def unsubscribe(self):
+        """Tell the daemon this client no longer needs sampler signals."""
+        if not self.is_connected:
+            return
+
+        self._proxy.call(
+            "Unsubscribe",
+            None,
+            Gio.DBusCallFlags.NONE,
+            5000,
+            None,
+            None,
+            None,
+        )
+
+    def on_daemon_restarted(self, callback):
+        """Call back when the daemon comes back on the bus.
+
+        A restarted daemon has forgotten its subscribers, so callers must
+        subscribe again. Sampler generations start over, too.
+
+        Args:
+            callback: function()
+        """
+        if self._proxy:
+            self._proxy.connect("notify::g-name-owner",
+                                self._on_name_owner_changed, callback)
+
+    def _on_name_owner_changed(self, proxy, pspec, callback):
+        if proxy.get_name_owner() is None:
+            return
+        self._frequency_generation = 0
+        callback()
+
     def on_governor_changed(self, callback):
         """Subscribe to GovernorChanged signal.
 
@@ -186,6 +758,116 @@ class CPUGovDBusClient:
             governor = params.unpack()[0]
             callback(governor)
 
+    def on_energy_preference_changed(self, callback):
+        """Subscribe to EnergyPreferenceChanged signal.
+
+        Args:
+            callback: function(new_preference_string)
+        """
+        if self._proxy:
+            self._proxy.connect("g-signal", self._on_energy_preference_signal,
+                                callback)
+
+    def _on_energy_preference_signal(self, proxy, sender, signal_name, params,
+                                     callback):
+        if signal_name == "EnergyPreferenceChanged":
+            callback(params.unpack()[0])
+
+    def on_boost_changed(self, callback):
+        """Subscribe to BoostChanged signal.
+
+        Args:
+            callback: function(enabled_bool)
+        """
+        if self._proxy:
+            self._proxy.connect("g-signal", self._on_boost_signal, callback)
+
+    def _on_boost_signal(self, proxy, sender, signal_name, params, callback):
+        if signal_name == "BoostChanged":
+            callback(params.unpack()[0])
+
+    def on_profile_changed(self, callback):
+        """Subscribe to ProfileChanged signal.
+
+        Args:
+            callback: function(profile_name_string)
+        """
+        if self._proxy:
+            self._proxy.connect("g-signal", self._on_profile_signal, callback)
+
+    def _on_profile_signal(self, proxy, sender, signal_name, params,
+                           callback):
+        if signal_name == "ProfileChanged":
+            callback(params.unpack()[0])
+
+    def on_frequencies_updated(self, callback):
+        """Subscribe to the daemon sampler's FrequenciesUpdated signal.
+
+        Only cores that changed are delivered. If a signal was missed the
+        client resynchronizes through GetCpuInfoSince before calling back.
+
+        Args:
+            callback: function(per_core_list, full) with one dict per
+                changed core holding "name", "governor", "cur_freq_khz"
+                and "busy_percent" (None when unknown); full means the
+                list covers every core
+        """
+        if self._proxy:
+            self._proxy.connect("g-signal", self._on_frequencies_signal,
+                                callback)
+
+    def _on_frequencies_signal(self, proxy, sender, signal_name, params,
+                               callback):
+        if signal_name != "FrequenciesUpdated":
+            return
+        since, generation, full, *columns = params.unpack()
+        if not full and since != self._frequency_generation:
+            self._get_cpu_info_since(callback)
+            return
+        self._frequency_generation = generation
+        callback(self._decode_frequency_columns(*columns), full)
+
+    def _get_cpu_info_since(self, callback):
+        """Fetch the cores changed since the last generation applied."""
+        if not self.is_connected:
+            return
+
+        self._proxy.call(
+            "GetCpuInfoSince",
+            GLib.Variant("(t)", (self._frequency_generation,)),
+            Gio.DBusCallFlags.NONE,
+            5000,
+            None,
+            self._on_get_cpu_info_since_done,
+            callback,
+        )
+
+    def _on_get_cpu_info_since_done(self, proxy, result, callback):
+        try:
+            variant = proxy.call_finish(result)
+        except GLib.Error:
+            return
+        generation, full, *columns = variant.unpack()[0]
+        self._frequency_generation = generation
+        callback(self._decode_frequency_columns(*columns), full)
+
+    @staticmethod
+    def _decode_frequency_columns(cpu_ids, cur_khz, governor_index,
+                                  governor_table, busy=None):
+        """Turn sampler columns into one dict per core."""
+        if busy is None:
+            busy = [255] * len(cpu_ids)
+        return [
+            {
+                "name": f"cpu{cpu_id}",
+                "governor": governor_table[gov],
+                "cur_freq_khz": cur,
+                "busy_percent": None if load == 255 else load,
+            }
+            for cpu_id, cur, gov, load in zip(cpu_ids, cur_khz,
+                                              governor_index, busy)
+        ]
+
     @staticmethod
     def _unpack_variant(value):
         """Recursively unpack GLib.Variant values to Python types."""
@@ -28,6 +28,26 @@ def _fmt_freq(khz_str):
         return "—"
 
 
+def _fmt_busy(percent):
+    """Format a core's busy percentage, or None when it is unknown."""
+    if percent is None or percent < 0:
+        return None
+    return _("%d%% busy") % percent
+
+
+def _fmt_cpus(cpus):
+    """Format CPU numbers as a compact list such as "0-3, 8"."""
+    ranges = []
+    for cpu in sorted(cpus):
+        if ranges and cpu == ranges[-1][1] + 1:
+            ranges[-1][1] = cpu
+        else:
+            ranges.append([cpu, cpu])
+    return ", ".join(
+        str(lo) if lo == hi else f"{lo}-{hi}" for lo, hi in ranges
+    )
+
+
 class CPUGovWindow(Adw.ApplicationWindow):
     """The main CPUGov window."""
 
@@ -39,7 +59,17 @@ class CPUGovWindow(Adw.ApplicationWindow):
         self._available_governors = []
         self._current_governor = None
         self._governor_buttons = {}
+        self._available_epps = []
+        self._current_epp = None
+        self._epp_buttons = {}
+        self._boost_enabled = None
+        self._profiles = []
+        self._current_profile = None
+        self._profile_buttons = {}
         self._core_rows = {}
+        # Policy key -> (expander row, {freq_khz: (row, level bar)})
+        self._residency_rows = {}
+        self._residency_since = 0
         self._settings = None
 
         # Try to load settings
@@ -78,6 +108,7 @@ class CPUGovWindow(Adw.ApplicationWindow):
             self._settings.set_int("window-width", width)
             self._settings.set_int("window-height", height)
 
+        self._dbus.unsubscribe()
         if self._refresh_timer:
             GLib.source_remove(self._refresh_timer)
             self._refresh_timer = None
@@ -205,6 +236,22 @@ class CPUGovWindow(Adw.ApplicationWindow):
         scrolled.set_child(clamp)
         self._main_box.append(scrolled)
 
+        # ── Profile Switcher ──────────────────────────────────────
+        self._profile_group = Adw.PreferencesGroup(title=_("Profile"))
+        self._profile_group.set_visible(False)
+
+        self._profile_box = Gtk.Box(
+            orientation=Gtk.Orientation.HORIZONTAL,
+            spacing=0,
+            halign=Gtk.Align.CENTER,
+            margin_top=8,
+            margin_bottom=8,
+        )
+        self._profile_box.add_css_class("linked")
+
+        self._profile_group.add(self._profile_box)
+        content.append(self._profile_group)
+
         # ── Governor Switcher ─────────────────────────────────────
         gov_group = Adw.PreferencesGroup(title=_("Governor"))
 
@@ -219,8 +266,37 @@ class CPUGovWindow(Adw.ApplicationWindow):
 
         # We'll populate buttons after getting available governors
         gov_group.add(self._governor_box)
+
+        # Only shown when the system exposes a turbo/boost switch
+        self._boost_row = Adw.ActionRow(
+            title=_("Turbo Boost"),
+            subtitle=_("Allow frequencies above the base clock"),
+        )
+        self._boost_switch = Gtk.Switch(valign=Gtk.Align.CENTER)
+        self._boost_switch.connect("notify::active", self._on_boost_toggled)
+        self._boost_row.add_suffix(self._boost_switch)
+        self._boost_row.set_activatable_widget(self._boost_switch)
+        self._boost_row.set_visible(False)
+        gov_group.add(self._boost_row)
         content.append(gov_group)
 
+        # ── Energy Preference Switcher ────────────────────────────
+        # Only shown when the cpufreq driver supports EPP
+        self._epp_group = Adw.PreferencesGroup(title=_("Energy Preference"))
+        self._epp_group.set_visible(False)
+
+        self._epp_box = Gtk.Box(
+            orientation=Gtk.Orientation.HORIZONTAL,
+            spacing=0,
+            halign=Gtk.Align.CENTER,
+            margin_top=8,
+            margin_bottom=8,
+        )
+        self._epp_box.add_css_class("linked")
+
+        self._epp_group.add(self._epp_box)
+        content.append(self._epp_group)
+
         # ── CPU Info ──────────────────────────────────────────────
         self._info_group = Adw.PreferencesGroup(title=_("Processor"))
         self._model_row = Adw.ActionRow(title=_("Model"))
@@ -236,14 +312,30 @@ class CPUGovWindow(Adw.ApplicationWindow):
         self._cores_group = Adw.PreferencesGroup(title=_("Per-Core Status"))
         content.append(self._cores_group)
 
-        # Start refresh
-        self._request_refresh()
-        interval = 2
-        if self._settings:
-            interval = self._settings.get_int("refresh-interval")
-        self._refresh_timer = GLib.timeout_add_seconds(
-            interval, self._on_refresh_tick
+        # ── Frequency Residency ───────────────────────────────────
+        # Only shown when the kernel keeps cpufreq statistics
+        self._residency_group = Adw.PreferencesGroup(
+            title=_("Frequency Residency"),
         )
+        self._residency_group.set_visible(False)
+
+        residency_buttons = Gtk.Box(spacing=6)
+        refresh_btn = Gtk.Button(icon_name="view-refresh-symbolic",
+                                 tooltip_text=_("Refresh"))
+        refresh_btn.add_css_class("flat")
+        refresh_btn.connect("clicked", self._on_residency_refresh_clicked)
+        reset_btn = Gtk.Button(icon_name="edit-clear-symbolic",
+                               tooltip_text=_("Measure from now"))
+        reset_btn.add_css_class("flat")
+        reset_btn.connect("clicked", self._on_residency_reset_clicked)
+        residency_buttons.append(refresh_btn)
+        residency_buttons.append(reset_btn)
+        self._residency_group.set_header_suffix(residency_buttons)
+        content.append(self._residency_group)
+        self._residency_rows.clear()
+
+        # Initial snapshot; live updates arrive via FrequenciesUpdated
+        self._request_refresh()
 
     # ── D-Bus Connection ──────────────────────────────────────────
 
@@ -258,11 +350,29 @@ class CPUGovWindow(Adw.ApplicationWindow):
         """Called when the D-Bus proxy is ready."""
         self._build_main_view()
 
-        # Subscribe to governor change signals
+        # Subscribe to governor change and sampler signals
         self._dbus.on_governor_changed(self._on_governor_signal)
+        self._dbus.on_frequencies_updated(self._on_frequencies_signal)
+        self._dbus.subscribe(self._refresh_interval() * 1000,
+                             self._on_subscribed)
+        self._dbus.on_daemon_restarted(self._on_daemon_restarted)
 
-        # Get available governors
+        # Get available governors and energy preferences
         self._dbus.get_available_governors(self._on_available_governors)
+        self._dbus.on_energy_preference_changed(self._on_epp_signal)
+        self._dbus.get_available_energy_preferences(self._on_available_epps)
+        self._dbus.on_boost_changed(self._on_boost_signal)
+        self._dbus.get_boost(self._on_boost_refresh)
+        self._dbus.on_profile_changed(self._on_profile_signal)
+        self._dbus.get_profiles(self._on_profiles)
+        self._request_residency()
+
+    def _on_daemon_restarted(self):
+        """Subscribe again and resync after the daemon restarted."""
+        self._dbus.subscribe(self._refresh_interval() * 1000,
+                             self._on_subscribed)
+        self._current_governor = None
+        self._request_refresh()
 
     def _on_daemon_error(self, message):
         """Called when daemon connection fails."""
@@ -381,12 +491,18 @@ class CPUGovWindow(Adw.ApplicationWindow):
             dialog.set_default_response("ok")
             dialog.present(self)
 
-            # Refresh to restore correct button state
+        if error or not success:
+            # Restore the button state; an active override (hold, lease,
+            # automatic switching, process rule) keeps its governor
+            self._current_governor = None
             self._request_refresh()
 
     def _on_governor_signal(self, governor):
         """Handle GovernorChanged signal from the daemon."""
         self._update_governor_ui(governor)
+        # Some drivers pin the energy preference for certain governors
+        if self._epp_buttons:
+            self._dbus.get_energy_preference(self._on_epp_refresh)
 
     def _update_governor_ui(self, governor):
         """Update button states to match the actual governor."""
@@ -413,16 +529,330 @@ class CPUGovWindow(Adw.ApplicationWindow):
                     btn.set_active(False)
                     btn.handler_unblock_by_func(self._on_governor_toggled)
 
-    # ── Refresh / Polling ─────────────────────────────────────────
+    # ── Energy Preference ─────────────────────────────────────────
+
+    def _on_available_epps(self, preferences, error):
+        """Called when available energy preferences are received."""
+        if error or not preferences:
+            return
+
+        self._available_epps = preferences
+        self._rebuild_epp_buttons()
+        self._epp_group.set_visible(True)
+        self._dbus.get_energy_preference(self._on_epp_refresh)
+
+    def _rebuild_epp_buttons(self):
+        """Create a linked toggle button for each energy preference."""
+        child = self._epp_box.get_first_child()
+        while child:
+            next_child = child.get_next_sibling()
+            self._epp_box.remove(child)
+            child = next_child
+        self._epp_buttons.clear()
+
+        first_btn = None
+        for epp in self._available_epps:
+            btn = Gtk.ToggleButton(label=epp.replace("_", " ").capitalize())
+            btn.set_focus_on_click(True)
+
+            if first_btn:
+                btn.set_group(first_btn)
+            else:
+                first_btn = btn
+
+            btn.connect("toggled", self._on_epp_toggled, epp)
+            self._epp_box.append(btn)
+            self._epp_buttons[epp] = btn
+
+        current, self._current_epp = self._current_epp, None
+        if current:
+            self._update_epp_ui(current)
+
+    def _on_epp_toggled(self, button, preference):
+        """Handle energy preference button toggle."""
+        if not button.get_active():
+            return
+        if preference == self._current_epp:
+            return
+        self._dbus.set_energy_preference(preference, self._on_set_epp_result)
+
+    def _on_set_epp_result(self, success, error):
+        """Called after attempting to set the energy preference."""
+        if error:
+            dialog = Adw.AlertDialog(
+                heading=_("Failed to Set Energy Preference"),
+                body=str(error),
+            )
+            dialog.add_response("ok", _("OK"))
+            dialog.set_default_response("ok")
+            dialog.present(self)
+
+        if error or not success:
+            # Restore the button state, also when an override keeps
+            # another preference
+            self._dbus.get_energy_preference(self._on_epp_refresh)
+
+    def _on_epp_signal(self, preference):
+        """Handle EnergyPreferenceChanged signal from the daemon."""
+        self._update_epp_ui(preference)
+
+    def _on_epp_refresh(self, preference, error):
+        """Update energy preference display."""
+        if error or not preference:
+            return
+        # Force an update so a reverted toggle is put back
+        self._current_epp = None
+        self._update_epp_ui(preference)
+
+    def _update_epp_ui(self, preference):
+        """Update button states to match the actual energy preference."""
+        if preference == self._current_epp:
+            return
+
+        self._current_epp = preference
+
+        for epp, btn in self._epp_buttons.items():
+            btn.handler_block_by_func(self._on_epp_toggled)
+            if epp == preference:
+                btn.set_active(True)
+                btn.add_css_class("suggested-action")
+            else:
+                btn.remove_css_class("suggested-action")
+                btn.set_active(False)
+            btn.handler_unblock_by_func(self._on_epp_toggled)
+
+    # ── Profiles ──────────────────────────────────────────────────
+
+    def _on_profiles(self, profiles, error):
+        """Called when the profile names are received."""
+        if error or not profiles:
+            return
+
+        self._profiles = profiles
+        self._rebuild_profile_buttons()
+        self._profile_group.set_visible(True)
+        self._dbus.get_active_profile(self._on_profile_refresh)
+
+    def _rebuild_profile_buttons(self):
+        """Create a linked toggle button for each profile."""
+        child = self._profile_box.get_first_child()
+        while child:
+            next_child = child.get_next_sibling()
+            self._profile_box.remove(child)
+            child = next_child
+        self._profile_buttons.clear()
+
+        first_btn = None
+        for profile in self._profiles:
+            btn = Gtk.ToggleButton(label=profile.replace("_", " ").capitalize())
+            btn.set_focus_on_click(True)
+
+            if first_btn:
+                btn.set_group(first_btn)
+            else:
+                first_btn = btn
+
+            btn.connect("toggled", self._on_profile_toggled, profile)
+            self._profile_box.append(btn)
+            self._profile_buttons[profile] = btn
+
+        current, self._current_profile = self._current_profile, None
+        if current is not None:
+            self._update_profile_ui(current)
+
+    def _on_profile_toggled(self, button, profile):
+        """Handle profile button toggle."""
+        if not button.get_active():
+            return
+        if profile == self._current_profile:
+            return
+        self._dbus.apply_profile(profile, self._on_apply_profile_result)
+
+    def _on_apply_profile_result(self, success, error):
+        """Called after attempting to apply a profile."""
+        if error:
+            dialog = Adw.AlertDialog(
+                heading=_("Failed to Apply Profile"),
+                body=str(error),
+            )
+            dialog.add_response("ok", _("OK"))
+            dialog.set_default_response("ok")
+            dialog.present(self)
+
+        if error or not success:
+            # Restore the button state, also when an override keeps
+            # some of the profile's settings
+            self._dbus.get_active_profile(self._on_profile_refresh)
+
+    def _on_profile_signal(self, profile):
+        """Handle ProfileChanged signal from the daemon."""
+        self._update_profile_ui(profile)
+
+    def _on_profile_refresh(self, profile, error):
+        """Update profile display."""
+        if error or profile is None:
+            return
+        # Force an update so a reverted toggle is put back
+        self._current_profile = None
+        self._update_profile_ui(profile)
+
+    def _update_profile_ui(self, profile):
+        """Highlight the active profile; none after manual changes."""
+        if profile == self._current_profile:
+            return
+
+        self._current_profile = profile
+
+        for name, btn in self._profile_buttons.items():
+            btn.handler_block_by_func(self._on_profile_toggled)
+            if name == profile:
+                btn.set_active(True)
+                btn.add_css_class("suggested-action")
+            else:
+                btn.remove_css_class("suggested-action")
+                btn.set_active(False)
+            btn.handler_unblock_by_func(self._on_profile_toggled)
+
+    # ── Frequency Residency ───────────────────────────────────────
+
+    def _request_residency(self):
+        """Fetch residency since the current baseline."""
+        self._dbus.get_frequency_residency(
+            [], self._residency_since, self._on_residency
+        )
+
+    def _on_residency_refresh_clicked(self, button):
+        """Update the histograms."""
+        self._request_residency()
+
+    def _on_residency_reset_clicked(self, button):
+        """Start measuring from now."""
+        self._dbus.get_frequency_residency([], 0, self._on_residency_reset)
+
+    def _on_residency_reset(self, result, error):
+        """Use the daemon's current time as the new baseline."""
+        if error or result is None:
+            return
+        self._residency_since = result["now_ns"]
+        self._request_residency()
+
+    def _on_residency(self, result, error):
+        """Show one histogram per cpufreq policy."""
+        if error or result is None:
+            return
+        # The daemon forgot our baseline and measured from its start
+        self._residency_since = result["since_ns"]
+
+        self._residency_group.set_visible(bool(result["policies"]))
+        for policy in result["policies"]:
+            key = tuple(policy["cpus"])
+            if key not in self._residency_rows:
+                title = (_("Core %s") % key[0] if len(key) == 1
+                         else _("CPUs %s") % _fmt_cpus(key))
+                expander = Adw.ExpanderRow(title=title)
+                self._residency_group.add(expander)
+                self._residency_rows[key] = (expander, {})
+            expander, bars = self._residency_rows[key]
+
+            total_ms = sum(ms for _khz, ms in policy["residency"]) or 1
+            expander.set_subtitle(
+                _("%d transitions") % policy["transitions"]
+            )
+            # Highest frequency first
+            for khz, ms in sorted(policy["residency"], reverse=True):
+                if khz not in bars:
+                    bar = Gtk.LevelBar(
+                        min_value=0, max_value=1,
+                        valign=Gtk.Align.CENTER, hexpand=True,
+                        width_request=160,
+                    )
+                    row = Adw.ActionRow(title=_fmt_freq(khz))
+                    row.add_css_class("property")
+                    row.add_suffix(bar)
+                    expander.add_row(row)
+                    bars[khz] = (row, bar)
+                row, bar = bars[khz]
+                share = ms / total_ms
+                bar.set_value(share)
+                row.set_subtitle(f"{share * 100:.1f}%  •  {ms / 1000:.1f} s")
+
+    # ── Turbo Boost ───────────────────────────────────────────────
+
+    def _on_boost_toggled(self, switch, pspec):
+        """Handle the turbo boost switch."""
+        enabled = switch.get_active()
+        if enabled == self._boost_enabled:
+            return
+        self._dbus.set_boost(enabled, self._on_set_boost_result)
+
+    def _on_set_boost_result(self, success, error):
+        """Called after attempting to change turbo boost."""
+        if error:
+            dialog = Adw.AlertDialog(
+                heading=_("Failed to Change Turbo Boost"),
+                body=str(error),
+            )
+            dialog.add_response("ok", _("OK"))
+            dialog.set_default_response("ok")
+            dialog.present(self)
+
+        if error or not success:
+            # Restore the switch state, also when an override keeps
+            # the other setting
+            self._dbus.get_boost(self._on_boost_refresh)
+
+    def _on_boost_signal(self, enabled):
+        """Handle BoostChanged signal from the daemon."""
+        self._update_boost_ui(enabled)
+
+    def _on_boost_refresh(self, enabled, error):
+        """Update turbo boost display; hidden when unsupported."""
+        if error or enabled is None:
+            return
+        self._boost_row.set_visible(True)
+        # Force an update so a reverted switch is put back
+        self._boost_enabled = None
+        self._update_boost_ui(enabled)
+
+    def _update_boost_ui(self, enabled):
+        """Update the switch to match the actual boost state."""
+        if enabled == self._boost_enabled:
+            return
+
+        self._boost_enabled = enabled
+        self._boost_switch.handler_block_by_func(self._on_boost_toggled)
+        self._boost_switch.set_active(enabled)
+        self._boost_switch.handler_unblock_by_func(self._on_boost_toggled)
+
+    # ── Refresh ───────────────────────────────────────────────────
+
+    def _refresh_interval(self):
+        """Return the configured refresh interval in seconds."""
+        if self._settings:
+            return max(self._settings.get_int("refresh-interval"), 1)
+        return 2
+
+    def _on_subscribed(self, interval_ms, error):
+        """Fall back to polling if the daemon cannot sample for us."""
+        if not error or self._refresh_timer:
+            return
+        self._refresh_timer = GLib.timeout_add_seconds(
+            self._refresh_interval(), self._on_refresh_tick
+        )
 
     def _on_refresh_tick(self):
-        """Called periodically by the refresh timer."""
+        """Called periodically by the fallback refresh timer."""
         if not self._dbus.is_connected:
+            self._refresh_timer = None
             return False  # Stop the timer
 
         self._request_refresh()
         return True  # Continue
 
+    def _on_frequencies_signal(self, per_core, full):
+        """Apply a (possibly partial) frequency update from the daemon."""
+        self._update_core_rows(per_core, full)
+
     def _request_refresh(self):
         """Request updated data from the daemon."""
         self._dbus.get_governor(self._on_governor_refresh)
@@ -465,8 +895,12 @@ class CPUGovWindow(Adw.ApplicationWindow):
         # Update per-core rows
         self._update_core_rows(per_core)
 
-    def _update_core_rows(self, per_core):
-        """Update or create per-core display rows."""
+    def _update_core_rows(self, per_core, full=True):
+        """Update or create per-core display rows.
+
+        A partial update (full=False) only touches the cores it lists and
+        leaves every other row as it is.
+        """
         existing_names = set(self._core_rows.keys())
         current_names = set()
 
@@ -475,24 +909,29 @@ class CPUGovWindow(Adw.ApplicationWindow):
             current_names.add(name)
             gov = core_info.get("governor", "?")
             cur_freq = core_info.get("cur_freq_khz", "0")
+            subtitle = f"{gov}  •  {_fmt_freq(cur_freq)}"
+            busy = _fmt_busy(core_info.get("busy_percent"))
+            if busy:
+                subtitle += f"  •  {busy}"
 
             if name in self._core_rows:
                 # Update existing row
                 row = self._core_rows[name]
-                row.set_subtitle(
-                    f"{gov}  •  {_fmt_freq(cur_freq)}"
-                )
+                row.set_subtitle(subtitle)
             else:
                 # Create new row
                 core_num = name.replace("cpu", "")
                 row = Adw.ActionRow(
                     title=_("Core %s") % core_num,
-                    subtitle=f"{gov}  •  {_fmt_freq(cur_freq)}",
+                    subtitle=subtitle,
                 )
                 row.add_css_class("property")
                 self._cores_group.add(row)
                 self._core_rows[name] = row
 
+        if not full:
+            return
+
         # Remove stale rows
         for name in existing_names - current_names:
             row = self._core_rows.pop(name)